@@ -0,0 +1,55 @@
+"""
+Startup cost of an upload worker process: time from `Process.start()` until the
+worker module is imported, and the resident memory of the worker at that point.
+
+    python benchmarks/worker_startup.py [--module logmd.worker] [--repeat 5]
+
+Compare `--module logmd.logmd` (the module the workers used to run from) with
+`--module logmd.worker`.
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import statistics
+import time
+
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def child(module: str, ready) -> None:
+    importlib.import_module(module)
+    ready.put((time.perf_counter(), rss_mb()))
+
+
+def measure(method: str, module: str, repeat: int):
+    context = multiprocessing.get_context(method)
+    times, rss = [], []
+    for _ in range(repeat):
+        ready = context.Queue()
+        process = context.Process(target=child, args=(module, ready))
+        t0 = time.perf_counter()
+        process.start()
+        t1, mb = ready.get()
+        process.join()
+        times.append(t1 - t0)
+        rss.append(mb)
+    return statistics.median(times), statistics.median(rss)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="logmd.worker")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    for method in ("spawn", "forkserver"):
+        seconds, mb = measure(method, args.module, args.repeat)
+        print(
+            f"{args.module:14s} {method:10s} start={seconds * 1e3:7.0f}ms rss={mb:6.1f}MB"
+        )
@@ -1,4 +1,17 @@
-from .logmd import LogMD
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .logmd import LogMD
 
 __version__ = "0.1.44"
 __all__ = ["LogMD"]
+
+
+def __getattr__(name: str):
+    # `logmd.logmd` imports the scientific stack, only load it when LogMD is used,
+    # e.g. not in upload worker processes which only need `logmd.worker`.
+    if name == "LogMD":
+        from .logmd import LogMD
+
+        return LogMD
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
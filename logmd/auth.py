@@ -1,5 +1,4 @@
 import rich
-import typer
 
 from logmd.constants import LOGMD_PREFIX, TOKEN_PATH
 from logmd.data_models import LogMDToken
@@ -19,6 +18,8 @@ def setup_token() -> None:
         token_obj = LogMDToken.model_validate_json(token)
     except ValidationError:
         rich.print(f"{LOGMD_PREFIX}[red]Invalid token[/red]")
+        import typer
+
         raise typer.Abort()
 
     TOKEN_PATH.write_text(token_obj.model_dump_json())
@@ -1,7 +1,6 @@
 from typer import Typer
 import rich
 from logmd.constants import TOKEN_PATH, LOGMD_PREFIX
-from logmd.auth import setup_token
 
 
 auth_app = Typer(
@@ -16,6 +15,8 @@ def login():
     """
     Login to LogMD, get a token, and save it in your home directory.
     """
+    from logmd.auth import setup_token
+
     setup_token()
 
 
@@ -1,12 +1,9 @@
 #!/usr/bin/env python
 import time
 import io
-from tqdm import tqdm
 from typer import Typer
 from pathlib import Path
-import ase
 import typer
-from logmd import LogMD
 from logmd.cli.auth import auth_app
 import sys 
 
@@ -27,6 +24,10 @@ def upload_file(
     """
     Upload a file to LogMD.
     """
+    import ase.io
+    from tqdm import tqdm
+    from logmd import LogMD
+
     logmd_obj = LogMD(project=project)
     content = file_path.read_text()
     model_count = content.count("\nMODEL")
@@ -60,6 +61,8 @@ def watch_from_terminal(file_path: Path):
     Watch a file and upload it to LogMD when it changes.
     """
     import hashlib
+    import ase.io
+    from logmd import LogMD
 
     hash = ""
     logmd_obj = LogMD()
@@ -72,6 +75,36 @@ def watch_from_terminal(file_path: Path):
         time.sleep(0.5)
 
 
+@app.command(name="sync")
+def sync_runs(
+    directory: Path = typer.Argument(help="Directory of runs recorded with `LogMD(offline=True)`."),
+    workers: int = typer.Option(default=8, help="Number of parallel upload workers."),
+    batch_size: int = typer.Option(default=16, help="Frames per upload request."),
+):
+    """
+    Upload runs recorded offline, skipping what was synced before.
+    """
+    from logmd.sync import sync
+
+    sync(str(directory), num_workers=workers, batch_size=batch_size)
+
+
+@app.command(name="export")
+def export_trajectory(
+    trajectory: Path = typer.Argument(help="A `trajectory.lmdt` written by `LogMD(store_locally=True)`."),
+    directory: Path = typer.Argument(default=None, help="Output directory, defaults to the trajectory's directory."),
+):
+    """
+    Write the frames of a local trajectory as one pdb file per frame.
+    """
+    import rich
+    from logmd.constants import LOGMD_PREFIX
+    from logmd.trajectory import TrajectoryReader
+
+    count = TrajectoryReader(str(trajectory)).export_pdb(str(directory or trajectory.parent))
+    rich.print(f"{LOGMD_PREFIX}Exported=[blue]{count}[/] frames to `{directory or trajectory.parent}`")
+
+
 @app.command(name="demos", rich_help_panel="Resources")
 def demos():
     """
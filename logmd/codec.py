@@ -0,0 +1,437 @@
+"""
+Compact run protocol.
+
+Instead of a full PDB string per frame, a run sends its topology (a PDB
+string) once and afterwards only fixed-point coordinate frames:
+
+    header   "<4sBBHII"  magic, kind, itemsize, step, num_atoms, base
+    body     num_atoms*3 zigzag encoded little-endian uints of `itemsize` bytes,
+             in units of `step` * 0.001 Angstrom
+    trailer  "<I" count followed by the uint32 flat indices of coordinates
+             that print as "-0.000"
+
+Coordinates are in units of 0.001 Angstrom, the precision of a PDB file, so
+rendering a decoded frame into the topology gives exactly the PDB string the
+viewer receives today. A keyframe stores absolute coordinates, a delta frame
+stores the difference to frame number `base`. Deltas between successive MD
+frames are small, so they are packed into 1 or 2 byte integers and compress
+far better than absolute coordinates.
+
+Lossless frames use step=1. The opt-in lossy mode quantizes with a larger step
+against the previously *reconstructed* frame (closed-loop predictive coding),
+so the error never accumulates and every decoded coordinate stays within the
+requested `max_error` of the original.
+
+The cell is part of the topology (its CRYST1 line). A frame whose cell differs
+from it (e.g. NPT) carries its own CRYST1 line in the record field `cryst1`,
+"" if the frame has none.
+
+Per-atom channels (forces, velocities, charges) are sent as channel frames in
+a record field named after the channel:
+
+    header   "<4sBBBBIIf"  magic, kind, encoding, itemsize, width, num_atoms,
+             base, resolution
+    body     num_atoms*width values, float16 (encoding 0) or zigzag encoded
+             uints of `itemsize` bytes in units of `resolution` (encoding 1)
+
+Float16 keeps about 3 significant digits and is always a keyframe. Quantized
+channels are delta coded like coordinates, closed-loop, so each decoded value
+is within `resolution / 2` of the original.
+"""
+
+import base64
+import struct
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from logmd.utils import PDBTemplate, quantize_positions
+
+MAGIC = b"LMDF"
+HEADER = struct.Struct("<4sBBHII")
+COUNT = struct.Struct("<I")
+KEYFRAME, DELTA = 0, 1
+CHANNEL_MAGIC = b"LMDA"
+CHANNEL_HEADER = struct.Struct("<4sBBBBIIf")
+FLOAT16, QUANTIZED = 0, 1
+# lossy max_error range (Angstrom): smaller ones need step 1 (lossless), larger ones a step beyond the uint16 header field.
+MIN_MAX_ERROR, MAX_MAX_ERROR = 0.0015, 32.767
+CHANNEL_WIDTHS = {"forces": 3, "velocities": 3, "charges": 1}
+CHANNEL_UNITS = {"forces": "eV/Angstrom", "velocities": "Angstrom/fs", "charges": "e"}
+
+
+class Frame(NamedTuple):
+    kind: int
+    base: int
+    values: (
+        np.ndarray
+    )  # Nx3 int64 milli-Angstrom, absolute (keyframe) or difference (delta)
+    negative_zeros: np.ndarray
+    size: int  # number of bytes the frame occupies
+
+
+def quantize(positions):
+    """Quantize positions, returns (milli-Angstrom ints, flat indices of negative zeros)."""
+    positions = np.asarray(positions, dtype=np.float64)
+    quantized = quantize_positions(positions)
+    negative_zeros = np.flatnonzero((quantized == 0) & np.signbit(positions))
+    return quantized, negative_zeros
+
+
+def zigzag(values) -> np.ndarray:
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def unzigzag(values) -> np.ndarray:
+    values = np.asarray(values, dtype=np.uint64)
+    return (values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(
+        np.int64
+    )
+
+
+def quantization_step(max_error: Optional[float]) -> int:
+    """
+    Largest odd step (milli-Angstrom) such that rounding milli-Angstrom coordinates
+    to it plus the 0.0005 Angstrom of the initial quantization stays within `max_error`.
+    """
+    if max_error is None:
+        return 1
+    if not MIN_MAX_ERROR <= max_error <= MAX_MAX_ERROR:
+        raise ValueError(
+            f"max_error must be between {MIN_MAX_ERROR} and {MAX_MAX_ERROR} Angstrom, got {max_error}. "
+            "Use max_error=None for lossless coordinates (PDB precision, within 0.0005 Angstrom)."
+        )
+    half = int(np.floor((max_error - 0.0005) * 1000 + 1e-9))
+    return 2 * half + 1
+
+
+def encode_frame(values, kind=KEYFRAME, base=0, negative_zeros=(), step=1) -> bytes:
+    """Encode an Nx3 array of coordinates (or deltas) in units of `step` milli-Angstrom."""
+    unsigned = zigzag(values)
+    largest = int(unsigned.max()) if unsigned.size else 0
+    itemsize = next(size for size in (1, 2, 4, 8) if largest < 2 ** (8 * size))
+    negative_zeros = np.asarray(negative_zeros, dtype="<u4")
+    header = HEADER.pack(MAGIC, kind, itemsize, step, len(unsigned), base)
+    body = unsigned.astype(f"<u{itemsize}").tobytes()
+    trailer = COUNT.pack(len(negative_zeros)) + negative_zeros.tobytes()
+    return header + body + trailer
+
+
+def decode_frame(buffer: bytes, offset: int = 0) -> Frame:
+    """Inverse of `encode_frame`, decodes the frame starting at `offset` of `buffer`."""
+    magic, kind, itemsize, step, num_atoms, base = HEADER.unpack_from(buffer, offset)
+    if magic != MAGIC or kind not in (KEYFRAME, DELTA):
+        raise ValueError("Not a logmd coordinate frame.")
+    position = offset + HEADER.size
+    body = np.frombuffer(
+        buffer, dtype=f"<u{itemsize}", count=num_atoms * 3, offset=position
+    )
+    values = unzigzag(body.astype(np.uint64)).reshape(num_atoms, 3) * step
+    position += body.nbytes
+    (count,) = COUNT.unpack_from(buffer, position)
+    position += COUNT.size
+    negative_zeros = np.frombuffer(buffer, dtype="<u4", count=count, offset=position)
+    position += negative_zeros.nbytes
+    return Frame(kind, base, values, negative_zeros, position - offset)
+
+
+def iter_frames(buffer: bytes):
+    """Iterate over the frames of concatenated `encode_frame` outputs."""
+    offset = 0
+    while offset < len(buffer):
+        frame = decode_frame(buffer, offset)
+        offset += frame.size
+        yield frame
+
+
+def cryst1(pdb_string: str) -> str:
+    """The CRYST1 line of a PDB string, "" if it has none."""
+    return (
+        pdb_string[: pdb_string.find("\n")] if pdb_string.startswith("CRYST1") else ""
+    )
+
+
+def replace_cryst1(pdb_string: str, line: str) -> str:
+    """`pdb_string` with its CRYST1 line replaced by `line` (removed if "")."""
+    if pdb_string.startswith("CRYST1"):
+        pdb_string = pdb_string[pdb_string.find("\n") + 1 :]
+    return f"{line}\n{pdb_string}" if line else pdb_string
+
+
+def is_delta(record: dict) -> bool:
+    """Whether `record` holds a delta frame or channel, which needs the frame before it."""
+    return any(
+        isinstance(value, bytes)
+        and value[:4] in (MAGIC, CHANNEL_MAGIC)
+        and value[4] == DELTA
+        for value in record.values()
+    )
+
+
+class FrameEncoder:
+    """
+    Turns positions into upload records of the compact protocol.
+
+    The topology is attached to the first record and again whenever it changes
+    (e.g. the number of atoms changes), every other record only carries the
+    coordinate frame (bytes, base64 encoded when the request is built). Every `keyframe_interval` frames a
+    keyframe is sent, the frames in between are deltas to the previous frame.
+
+    With `max_error` (Angstrom, 0.0015 to 32.767, else ValueError) coordinates
+    are stored lossy, each decoded coordinate is guaranteed to be within
+    `max_error` of the logged one.
+    """
+
+    def __init__(self, keyframe_interval: int = 1, max_error: Optional[float] = None):
+        assert keyframe_interval >= 1, "keyframe_interval must be positive"
+        self.keyframe_interval = keyframe_interval
+        self.max_error = max_error
+        self.step = quantization_step(max_error)
+        self.topology: Optional[PDBTemplate] = None
+        self.previous: Optional[np.ndarray] = None
+        self.raw_bytes = 0  # the frames as float32 coordinates
+        self.encoded_bytes = 0
+
+    @property
+    def compression_ratio(self) -> float:
+        return self.raw_bytes / max(self.encoded_bytes, 1)
+
+    def set_topology(self, pdb_string: str) -> None:
+        """`pdb_string` is sent as is, frames are rendered keeping its trailing newline."""
+        self.topology = PDBTemplate(pdb_string, trailing_newline=True)
+        self.cryst1 = cryst1(pdb_string)
+        self._topology_sent = False
+        self.force_keyframe()
+
+    def force_keyframe(self) -> None:
+        """Make the next frame a keyframe, e.g. after frames were dropped."""
+        self.previous = None
+
+    def resend_topology(self) -> None:
+        """Attach the topology to the next record again, e.g. after it was dropped."""
+        self._topology_sent = False
+
+    def encode_bytes(self, positions, frame_num: int) -> bytes:
+        assert self.topology is not None, "set_topology must be called first"
+        quantized, negative_zeros = quantize(
+            np.asarray(positions)[: len(self.topology)]
+        )
+        if self.step > 1:
+            negative_zeros = ()
+        if self.previous is None or self.since_keyframe >= self.keyframe_interval:
+            kind, base, prediction = KEYFRAME, 0, np.zeros_like(quantized)
+            self.since_keyframe = 0
+        else:
+            kind, base, prediction = DELTA, self.previous_num, self.previous
+        # rounds to the nearest multiple of the odd step, error <= step // 2.
+        residual = np.floor_divide(quantized - prediction + self.step // 2, self.step)
+        frame = encode_frame(residual, kind, base, negative_zeros, self.step)
+        self.previous, self.previous_num = prediction + residual * self.step, frame_num
+        self.since_keyframe += 1
+        self.raw_bytes += quantized.size * 4
+        self.encoded_bytes += len(frame)
+        return frame
+
+    def encode(self, positions, frame_num: int, cryst1: Optional[str] = None) -> dict:
+        """`cryst1` is the CRYST1 line of the frame's cell, if it can differ from the topology's."""
+        record = {"encoding": "lmd", "frame": self.encode_bytes(positions, frame_num)}
+        if not self._topology_sent:
+            record["topology"] = self.topology.pdb_string
+            self._topology_sent = True
+        if cryst1 is not None and cryst1 != self.cryst1:
+            record["cryst1"] = cryst1
+        return record
+
+
+class FrameDecoder:
+    """Reconstructs the PDB string of each record produced by `FrameEncoder`."""
+
+    def __init__(self, topology: str = ""):
+        self.topology: Optional[PDBTemplate] = None
+        self.previous: Optional[np.ndarray] = None
+        if topology != "":
+            self.set_topology(topology)
+
+    def set_topology(self, pdb_string: str) -> None:
+        self.topology = PDBTemplate(pdb_string, trailing_newline=True)
+        self.previous = None
+
+    def decode(self, record: dict) -> str:
+        if "topology" in record:
+            self.set_topology(record["topology"])
+        if record.get("encoding") != "lmd":
+            return record["file_contents"]
+        frame = record["frame"]
+        if isinstance(frame, str):
+            frame = base64.b64decode(frame)
+        pdb_string = self.decode_bytes(frame, int(record["frame_num"]))
+        if "cryst1" in record:
+            pdb_string = replace_cryst1(pdb_string, record["cryst1"])
+        return pdb_string
+
+    def decode_bytes(self, buffer: bytes, frame_num: int) -> str:
+        if self.topology is None:
+            raise ValueError(f"Frame {frame_num} received before its topology.")
+        frame = decode_frame(buffer)
+        if frame.kind == KEYFRAME:
+            quantized = frame.values
+        elif self.previous is not None and frame.base == self.previous_num:
+            quantized = self.previous + frame.values
+        else:
+            raise ValueError(
+                f"Frame {frame_num} is a delta to missing frame {frame.base}."
+            )
+        self.previous, self.previous_num = quantized, frame_num
+        negative = quantized < 0
+        negative.flat[frame.negative_zeros] = True
+        return self.topology.render_quantized(quantized, negative)
+
+
+class ChannelEncoder:
+    """
+    Turns a per-atom array (e.g. forces) into channel frames. Without
+    `resolution` values are sent as float16, with it they are quantized to
+    multiples of `resolution` and every `keyframe_interval` frame is a
+    keyframe, the others deltas to the previous frame. Float16 overflows to
+    inf beyond 65504, use a resolution for larger values.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        resolution: Optional[float] = None,
+        keyframe_interval: int = 10,
+    ):
+        assert resolution is None or resolution > 0, "resolution must be positive"
+        self.width = width
+        # the header holds a float32, quantize with exactly the resolution the decoder sees.
+        self.resolution = None if resolution is None else float(np.float32(resolution))
+        self.keyframe_interval = keyframe_interval
+        self.previous: Optional[np.ndarray] = None
+        self.raw_bytes = 0  # the values as float32
+        self.encoded_bytes = 0
+
+    def force_keyframe(self) -> None:
+        self.previous = None
+
+    def encode(self, values, frame_num: int) -> bytes:
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.width)
+        num_atoms = len(values)
+        if self.resolution is None:
+            header = CHANNEL_HEADER.pack(
+                CHANNEL_MAGIC, KEYFRAME, FLOAT16, 2, self.width, num_atoms, 0, 0.0
+            )
+            frame = header + values.astype("<f2").tobytes()
+        else:
+            quantized = np.rint(values / self.resolution).astype(np.int64)
+            keyframe = self.previous is None or self.previous.shape != quantized.shape
+            if keyframe or self.since_keyframe >= self.keyframe_interval:
+                kind, base, residual = KEYFRAME, 0, quantized
+                self.since_keyframe = 0
+            else:
+                kind, base, residual = (
+                    DELTA,
+                    self.previous_num,
+                    quantized - self.previous,
+                )
+            self.previous, self.previous_num = quantized, frame_num
+            self.since_keyframe += 1
+            frame = encode_channel(residual, kind, base, self.resolution)
+        self.raw_bytes += values.size * 4
+        self.encoded_bytes += len(frame)
+        return frame
+
+
+def encode_channel(values, kind=KEYFRAME, base=0, resolution=1.0) -> bytes:
+    """Encode a (num_atoms, width) array of quantized values (or deltas) in units of `resolution`."""
+    unsigned = zigzag(values)
+    largest = int(unsigned.max()) if unsigned.size else 0
+    itemsize = next(size for size in (1, 2, 4, 8) if largest < 2 ** (8 * size))
+    num_atoms, width = values.shape
+    header = CHANNEL_HEADER.pack(
+        CHANNEL_MAGIC, kind, QUANTIZED, itemsize, width, num_atoms, base, resolution
+    )
+    return header + unsigned.astype(f"<u{itemsize}").tobytes()
+
+
+class ChannelDecoder:
+    """Inverse of `ChannelEncoder`, returns (num_atoms, width) float arrays."""
+
+    def __init__(self):
+        self.previous: Optional[np.ndarray] = None
+
+    def decode(self, buffer, frame_num: int) -> np.ndarray:
+        if isinstance(buffer, str):
+            buffer = base64.b64decode(buffer)
+        magic, kind, encoding, itemsize, width, num_atoms, base, resolution = (
+            CHANNEL_HEADER.unpack_from(buffer)
+        )
+        if magic != CHANNEL_MAGIC:
+            raise ValueError("Not a logmd channel frame.")
+        dtype = "<f2" if encoding == FLOAT16 else f"<u{itemsize}"
+        body = np.frombuffer(
+            buffer, dtype=dtype, count=num_atoms * width, offset=CHANNEL_HEADER.size
+        )
+        if encoding == FLOAT16:
+            return body.astype(np.float32).reshape(num_atoms, width)
+        values = unzigzag(body.astype(np.uint64)).reshape(num_atoms, width)
+        if kind == DELTA:
+            if self.previous is None or base != self.previous_num:
+                raise ValueError(
+                    f"Channel frame {frame_num} is a delta to missing frame {base}."
+                )
+            values = self.previous + values
+        self.previous, self.previous_num = values, frame_num
+        return values * np.float32(resolution)
+
+
+class KeyframeRewriter:
+    """
+    Rewrites the delta frames and channels of the records of a run as keyframes,
+    so each record decodes without the frame before it (e.g. frames a spool
+    replays after their successors). Must be fed every record of the run in order.
+    """
+
+    def __init__(self):
+        self.previous: dict = {}  # field -> (frame_num, absolute values)
+
+    def rewrite(self, record: dict) -> dict:
+        """Returns `record`, or a copy with keyframes for its deltas."""
+        frame_num = int(record["frame_num"])
+        rewritten = record
+        for field, value in record.items():
+            if not isinstance(value, bytes) or value[:4] not in (MAGIC, CHANNEL_MAGIC):
+                continue
+            if value[:4] == MAGIC:
+                frame = decode_frame(value)
+                step = HEADER.unpack_from(value)[3]
+                kind, base, values = frame.kind, frame.base, frame.values
+            else:
+                _, kind, encoding, itemsize, width, num_atoms, base, resolution = (
+                    CHANNEL_HEADER.unpack_from(value)
+                )
+                if encoding == FLOAT16:
+                    continue
+                body = np.frombuffer(
+                    value,
+                    dtype=f"<u{itemsize}",
+                    count=num_atoms * width,
+                    offset=CHANNEL_HEADER.size,
+                )
+                values = unzigzag(body.astype(np.uint64)).reshape(num_atoms, width)
+            if kind == DELTA:
+                previous_num, previous = self.previous.pop(field, (None, None))
+                if previous_num != base:
+                    continue  # kept as delta, as are the frames after it until a keyframe.
+                values = previous + values
+                if rewritten is record:
+                    rewritten = dict(record)
+                if value[:4] == MAGIC:
+                    rewritten[field] = encode_frame(
+                        values // step, KEYFRAME, 0, frame.negative_zeros, step
+                    )
+                else:
+                    rewritten[field] = encode_channel(values, KEYFRAME, 0, resolution)
+            self.previous[field] = (frame_num, values)
+        return rewritten
@@ -0,0 +1,70 @@
+import time
+import zlib
+
+# payloads below this size are sent as is.
+MIN_SIZE = 1024
+LEVELS = (1, 3, 6, 9)
+
+
+class AdaptiveCompressor:
+    """
+    Compresses upload bodies with zlib ("deflate" content encoding), choosing
+    the level per payload.
+
+    For every level it keeps a running estimate of the compression time and
+    ratio, and for the connection the upload time per sent byte. The level
+    with the lowest expected `compress_time * (1 + backlog) + upload_time` is
+    used: while the upload queue backs up the worker is CPU bound and cheap
+    levels win, while it is empty the network dominates and heavy levels win.
+    Every `explore` payloads a neighbouring level is tried to keep the
+    estimates fresh. Payloads below `MIN_SIZE`, or that deflate does not
+    shrink, are sent as is.
+    """
+
+    def __init__(self, explore: int = 32, smoothing: float = 0.2):
+        self.explore = explore
+        self.smoothing = smoothing
+        self.seconds_per_byte = {level: 0.0 for level in LEVELS}
+        self.ratio = {level: 1.0 for level in LEVELS}
+        self.upload_seconds_per_byte = 0.0
+        self.level = 6
+        self.count = 0
+
+    def _update(self, old: float, new: float) -> float:
+        return new if old == 0.0 else (1 - self.smoothing) * old + self.smoothing * new
+
+    def choose_level(self, backlog: int = 0) -> int:
+        def cost(level):
+            compress = self.seconds_per_byte[level] * (1 + backlog)
+            return compress + self.ratio[level] * self.upload_seconds_per_byte
+
+        self.count += 1
+        best = min(LEVELS, key=cost)
+        if self.count % self.explore == 0:
+            index = LEVELS.index(best) + (1 if (self.count // self.explore) % 2 else -1)
+            best = LEVELS[min(max(index, 0), len(LEVELS) - 1)]
+        self.level = best
+        return best
+
+    def compress(self, body: bytes, backlog: int = 0):
+        """Returns (payload, content encoding or None)."""
+        if len(body) < MIN_SIZE:
+            return body, None
+        level = self.choose_level(backlog)
+        t0 = time.perf_counter()
+        compressed = zlib.compress(body, level)
+        seconds = time.perf_counter() - t0
+        self.seconds_per_byte[level] = self._update(
+            self.seconds_per_byte[level], seconds / len(body)
+        )
+        self.ratio[level] = self._update(self.ratio[level], len(compressed) / len(body))
+        if len(compressed) >= len(body):
+            return body, None
+        return compressed, "deflate"
+
+    def observe_upload(self, sent_bytes: int, seconds: float) -> None:
+        """Feed back how long sending `sent_bytes` took."""
+        if sent_bytes > 0:
+            self.upload_seconds_per_byte = self._update(
+                self.upload_seconds_per_byte, seconds / sent_bytes
+            )
@@ -0,0 +1,190 @@
+"""
+Memory-mapped local run store, `LogMD(store_locally=True, local_format="memmap")`.
+
+A run directory `logmd/<run_id>/` holds
+    topology.pdb  the pdb string of the first frame, atoms and their order
+    coords.f32    float32 coordinates, frames x atoms x 3, no header
+    frames.idx    per frame: uint64 frame_num, float32 3x3 cell
+
+Coordinates are rounded to 0.001 Angstrom (the precision of a pdb file)
+before they are stored, so `LocalRun.pdb` renders exactly the pdb of the
+frame, float32 alone rounds differently next to 0.0005 boundaries.
+
+Every frame has the same size, so frame i starts at byte i * atoms * 12 and
+`LocalRun` maps the files with `numpy.memmap`: indexing, slicing and strides
+only read the pages of the requested frames, runs larger than RAM work.
+
+Coordinates are written before the index entry, a run is as long as the
+shorter of both files, so a run whose process died is still readable.
+"""
+
+import os
+import time
+
+import numpy as np
+
+from logmd.codec import replace_cryst1
+from logmd.trajectory import FreeSpace
+from logmd.utils import PDBTemplate, cell_cryst1_line, quantize_positions
+
+TOPOLOGY, COORDS, INDEX = "topology.pdb", "coords.f32", "frames.idx"
+INDEX_DTYPE = np.dtype([("frame_num", "<u8"), ("cell", "<f4", (3, 3))])
+
+
+def _num_frames(path: str, num_atoms: int) -> int:
+    coords = os.path.getsize(os.path.join(path, COORDS)) // (num_atoms * 12)
+    return min(
+        coords, os.path.getsize(os.path.join(path, INDEX)) // INDEX_DTYPE.itemsize
+    )
+
+
+class CoordinateWriter:
+    """
+    Appends frames to the run directory `path`. The topology is set with the
+    first frame, later frames must have the same number of atoms. Files are
+    fsynced at most every `fsync_interval` seconds, frames are skipped while
+    less than `min_free_bytes` are free (see `FreeSpace`).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = 1 << 20,
+        fsync_interval: float = 10.0,
+        min_free_bytes: int = 1_000_000_000,
+    ):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.buffer_size = buffer_size
+        self.fsync_interval = fsync_interval
+        self.has_space = FreeSpace(path, min_free_bytes)
+        self.num_atoms = 0
+        self.coords = self.index = None
+        self.last_sync = time.monotonic()
+        if os.path.exists(os.path.join(path, TOPOLOGY)):
+            with open(os.path.join(path, TOPOLOGY)) as f:
+                self._open(f.read())
+
+    def _open(self, topology: str) -> None:
+        self.num_atoms = len(PDBTemplate(topology))
+        assert self.num_atoms > 0, "The topology has no ATOM/HETATM records"
+        self.coords = open(
+            os.path.join(self.path, COORDS), "ab", buffering=self.buffer_size
+        )
+        self.index = open(
+            os.path.join(self.path, INDEX), "ab", buffering=self.buffer_size
+        )
+        if not os.path.exists(os.path.join(self.path, TOPOLOGY)):
+            with open(os.path.join(self.path, TOPOLOGY), "w") as f:
+                f.write(topology)
+        # drop a torn last frame of an earlier process.
+        count = _num_frames(self.path, self.num_atoms)
+        self.coords.truncate(count * self.num_atoms * 12)
+        self.index.truncate(count * INDEX_DTYPE.itemsize)
+
+    def append(self, frame_num: int, positions, cell=None, topology: str = "") -> bool:
+        """
+        Appends a frame, returns False if it was skipped because the disk is almost
+        full. `topology` is only used by the first frame.
+        """
+        if self.coords is None:
+            self._open(topology)
+        positions = np.asarray(positions, dtype=np.float64)
+        if positions.shape != (self.num_atoms, 3):
+            raise ValueError(
+                f"The run has {self.num_atoms} atoms, got positions of shape {positions.shape}"
+            )
+        if not self.has_space():
+            return False
+        # the sign keeps "-0.000", non-finite coordinates are stored as they are.
+        finite = np.isfinite(positions)
+        rounded = quantize_positions(np.where(finite, positions, 0.0)) / 1000
+        positions = np.where(finite, np.copysign(rounded, positions), positions).astype(
+            "<f4"
+        )
+        entry = np.zeros((), dtype=INDEX_DTYPE)
+        entry["frame_num"] = frame_num
+        if cell is not None:
+            entry["cell"] = cell
+        self.coords.write(positions.tobytes())
+        self.index.write(entry.tobytes())
+        self.has_space.written(positions.nbytes + INDEX_DTYPE.itemsize)
+
+        if time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+        return True
+
+    def sync(self) -> None:
+        for f in (self.coords, self.index):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        self.last_sync = time.monotonic()
+
+    def close(self) -> None:
+        self.sync()
+        for f in (self.coords, self.index):
+            if f is not None:
+                f.close()
+        self.coords = self.index = None
+
+
+class LocalRun:
+    """
+    Read-only view of a run directory written by `CoordinateWriter`.
+
+    Usage:
+
+    ```python
+    run = LogMD.open_local("brave-otter-3")
+    run[0]            # positions of the first frame, (atoms, 3) float32
+    run[-100::10]     # every 10th of the last 100 frames, (10, atoms, 3)
+    run.pdb(5)        # the pdb string of the sixth frame
+    ```
+
+    Indexing returns views of the memory map, copy them to keep them after the
+    run is closed. Frames appended after opening are not seen, open it again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, TOPOLOGY)) as f:
+            self.topology = f.read()
+        self.template = PDBTemplate(self.topology, trailing_newline=True)
+        self.num_atoms = len(self.template)
+        count = _num_frames(path, self.num_atoms)
+        if count == 0:
+            self.positions = np.zeros((0, self.num_atoms, 3), dtype="<f4")
+            self.index = np.zeros(0, dtype=INDEX_DTYPE)
+        else:
+            self.positions = np.memmap(
+                os.path.join(path, COORDS), "<f4", "r", shape=(count, self.num_atoms, 3)
+            )
+            self.index = np.memmap(
+                os.path.join(path, INDEX), INDEX_DTYPE, "r", shape=(count,)
+            )
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __getitem__(self, i) -> np.ndarray:
+        return self.positions[i]
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    @property
+    def frame_nums(self) -> np.ndarray:
+        return self.index["frame_num"]
+
+    @property
+    def cells(self) -> np.ndarray:
+        return self.index["cell"]
+
+    def pdb(self, i: int) -> str:
+        """The topology with the coordinates and, if it changed since the first frame, the cell of frame `i`."""
+        pdb_string = self.template.render(self.positions[i])
+        cell = self.cells[i]
+        if cell.any() and not np.array_equal(cell, self.cells[0]):
+            pdb_string = replace_cryst1(pdb_string, cell_cryst1_line(cell))
+        return pdb_string
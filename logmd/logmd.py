@@ -1,29 +1,49 @@
 import httpx
-import multiprocessing
-from multiprocessing import Queue
-import time 
-import requests
 import time
 import hashlib
+import secrets
 import atexit
 import io 
 import os 
-import ase.io
-from openmm import unit  # type: ignore[import-untyped]
-import random
 import rich
-from typing import Optional
+from typing import Any, NamedTuple, Optional
+import threading
+import numpy as np
 import base64
-from tqdm import tqdm
 import zipfile
-from ase import units
+import json
+import queue
+import shutil
 
-from logmd.constants import LOGMD_PREFIX, eV_to_K
+from logmd.codec import CHANNEL_WIDTHS, ChannelEncoder, FrameEncoder, is_delta
+from logmd.local import CoordinateWriter, LocalRun
+from logmd.metrics import MetricRollups, MetricsEncoder, MetricsTable, MetricsWriter, numeric
+from logmd.pool import SharedUploadPool, shared_pool
+from logmd.queues import ArrayPool, BoundedQueue, record_size
+from logmd.ring import SharedFrameRing
+from logmd.spool import RunLog, Spool
+from logmd.stats import StatusCollector, UploadStats, status_line
+from logmd.trajectory import TrajectoryWriter
+from logmd.upload import AsyncUploader
+from logmd.constants import LOGMD_PREFIX, eV_to_K, kJ_per_mol_to_eV
 from logmd.data_models import LogMDToken
-from logmd.utils import is_dev, get_fe_base_url, get_run_id, get_upload_url, update_pdb_positions, fix_pdb_bfactor_string, clean_for_ASE
+from logmd.utils import is_dev, get_fe_base_url, get_run_id, PDBTemplate, cryst1_line, pdb_positions, pdb_string_positions, fix_pdb_bfactor_string, clean_for_ASE
 from logmd.auth import load_token
 
 
+class Snapshot(NamedTuple):
+    """What `LogMD.__call__` takes from the simulation, the rest happens in `LogMD.encode`."""
+    frame_num: int
+    atoms: Any  # pdb string or ase.Atoms
+    positions: Optional[np.ndarray]  # copies, set when encoding in the background
+    cell: Optional[np.ndarray]
+    pbc: Optional[np.ndarray]
+    metrics: dict  # name -> (value, unit)
+    data_dict: dict
+    calc: Any
+    channels: dict  # name -> per-atom array, see `LogMD.channel_values`
+
+
 class LogMD:
     def __init__(
         self,
@@ -33,7 +53,31 @@ class LogMD:
         interval: int = 100,
         pdb: str = "",
         store_locally: bool = False, # store locally 
-        zip: bool = False # zip when done. 
+        zip: bool = False, # zip when done. 
+        frame_format: str = "pdb",
+        keyframe_interval: int = 10,
+        max_error: Optional[float] = None,
+        compress: bool = False,
+        batch_size: int = 1,
+        linger_ms: float = 0.0,
+        engine: str = "process",
+        transport: str = "queue",
+        max_queue_frames: int = 1000,
+        max_queue_bytes: int = 1 << 30,
+        shm_bytes: Optional[int] = None,
+        backpressure: str = "block",
+        encode_in_background: bool = False,
+        min_workers: int = 1,
+        max_workers: int = 8,
+        idle_timeout: float = 30.0,
+        spool: Optional[str] = None,
+        offline: bool = False,
+        local_format: str = "pdb",
+        metrics_format: str = "text",
+        rollups: bool = False,
+        metrics_interval: int = 1,
+        channels=(),
+        openmm_energies: bool = False,
     ):
         """
         LogMD logs ase.Atoms objects to rscb.ai.
@@ -52,10 +96,70 @@ class LogMD:
         ```
 
         Args:
-            num_workers: number of worker processes to use for uploading.
+            num_workers: number of upload worker processes started with the first frame.
+                With the process engine all LogMD objects of a process share one pool of
+                workers (see `SharedUploadPool`), the worker settings, batch_size and linger_ms
+                of the first one apply.
             project: project name.
             template: template pdb file.
             interval: interval of logging.
+            frame_format: "pdb" uploads a full pdb string per frame, "binary" uploads
+                the topology once and afterwards only fixed-point coordinates.
+            keyframe_interval: with frame_format="binary" every `keyframe_interval`
+                frame holds absolute coordinates, the others deltas to the previous frame.
+            max_error: store coordinates lossy with at most `max_error` Angstrom error
+                per coordinate (0.0015 to 32.767), implies frame_format="binary".
+            compress: deflate upload requests, the level adapts to the upload backlog
+                and network speed.
+            batch_size: frames per upload request, grows automatically while uploads
+                are backlogged. 1 disables batching.
+            linger_ms: how long a worker waits for a batch to fill up.
+            engine: "process" uploads from `num_workers` processes, "async" from one
+                background thread keeping many requests in flight (HTTP/2 if `h2` is installed).
+            transport: with the process engine, "queue" pickles each frame through the
+                upload queue, "shm" passes it through a shared memory ring instead.
+            max_queue_frames: maximum number of frames waiting for upload.
+            max_queue_bytes: maximum size of the frames waiting for upload.
+            shm_bytes: with transport="shm", maximum size of the shared memory ring, defaults to
+                `max_queue_bytes`. The ring also takes at most half the free space of /dev/shm,
+                frames go through the queue if no ring fits.
+            backpressure: what to do with a frame that does not fit in the upload queue:
+                "block", "drop_oldest", "drop_newest" or "coalesce" (see `BoundedQueue`). Queued
+                binary deltas of a dropped frame are dropped with it, the next frame is a keyframe.
+            encode_in_background: only copy positions, cell and scalars in the simulation
+                thread, pdb/binary encoding and local storage happen in a background thread.
+                Its queue of snapshots is bounded and handled like the upload queue.
+            min_workers: with the process engine, workers are retired down to `min_workers`
+                once the upload queue stayed empty for `idle_timeout` seconds.
+            max_workers: workers are added up to `max_workers` while the queue takes
+                longer than a second to drain at the current upload latency.
+            idle_timeout: seconds without backlog before a worker is retired.
+            spool: directory of a durable upload spool (see `logmd.spool`). Frames are
+                written to it before upload and retried until the backend accepted them,
+                frames an earlier process left in it are uploaded too.
+            offline: record the run to `spool` (default `./logmd`) without any network
+                calls, upload it later with `logmd sync <dir>`.
+            local_format: with store_locally=True, "pdb" appends the pdb string of each frame
+                to `logmd/<run_id>/trajectory.lmdt` (see `logmd.trajectory`), "memmap" stores
+                float32 coordinates for random access with `LogMD.open_local` (see `logmd.local`).
+                Either way the scalars of each frame go to a columnar table, see `LogMD.open_metrics`.
+            metrics_format: "text" uploads energy, temperature etc. as "<value> [<unit>]" strings
+                in `data_dict`, "packed" declares names, dtypes and units once and uploads each
+                frame's numeric values as a packed vector (see `logmd.metrics`).
+            rollups: aggregate every numeric metric into min/mean/max buckets of 16, 32, 64, ...
+                frames, completed buckets are uploaded with the next frame (see `MetricRollups`).
+                Buckets of a frame the backpressure policy drops are uploaded with the next one,
+                frames dropped before encoding (encode_in_background) are not in the buckets.
+            metrics_interval: upload the numeric metrics of every `metrics_interval`-th frame
+                only, for runs with millions of frames. Requires rollups=True, which cover the
+                metrics of the other frames.
+            channels: per-atom arrays to upload with each frame, any of "forces" (eV/Angstrom),
+                "velocities" (Angstrom/fs) and "charges" (e). A list sends them as float16, a dict
+                maps each name to a resolution (e.g. {"forces": 0.01}) to quantize and delta
+                code it instead, None meaning float16 (see `logmd.codec`).
+            openmm_energies: as OpenMM reporter, also request the energies and log the potential
+                and kinetic energy and the temperature. Computing the energy costs about one
+                extra force evaluation per report, without it OpenMM only copies positions.
         """
         t0 = time.time()
         self.frame_num: int = 0
@@ -67,11 +171,40 @@ class LogMD:
         self.zip = zip
         self.path = os.getcwd()
         self.disk_space_warning_shown = False  # Track if warning has been shown
+        assert local_format in ("pdb", "memmap"), f"Unknown local_format `{local_format}`"
+        self.local_format = local_format
+        self.local_store: Any = None  # TrajectoryWriter or CoordinateWriter
+        self.metrics_store: Optional[MetricsWriter] = None
+        assert frame_format in ("pdb", "binary"), f"Unknown frame_format `{frame_format}`"
+        self.frame_format = "binary" if max_error is not None else frame_format
+        self.encoder = FrameEncoder(keyframe_interval, max_error)
+        assert metrics_format in ("text", "packed"), f"Unknown metrics_format `{metrics_format}`"
+        self.metrics_encoder = MetricsEncoder() if metrics_format == "packed" else None
+        assert metrics_interval >= 1, "metrics_interval must be positive"
+        assert metrics_interval == 1 or rollups, "metrics_interval > 1 requires rollups=True"
+        self.metrics_interval = metrics_interval
+        self.rollups = MetricRollups() if rollups else None
+        self.pending_rollups: list = []  # buckets of dropped records, sent with the next one
+        self.header_puts: dict = {}  # "topology"/"metrics_schema" -> frames queued since the last record carrying it
+        if not isinstance(channels, dict):
+            channels = dict.fromkeys(channels)
+        for name in channels:
+            assert name in CHANNEL_WIDTHS, f"Unknown channel `{name}`, use some of {tuple(CHANNEL_WIDTHS)}"
+        self.channel_encoders = {
+            name: ChannelEncoder(CHANNEL_WIDTHS[name], resolution, keyframe_interval)
+            for name, resolution in channels.items()
+        }
+        self.openmm_energies = openmm_energies
+        self.openmm_dof: Optional[int] = None
 
         if self.pdb != "":
             self.pdb = open(self.pdb, 'r').read()
+            self.pdb_template = PDBTemplate(self.pdb)
+            self.encoder.set_topology("\n".join(self.pdb.splitlines()))
 
         if template != "":
+            import ase.io
+
             template_or_templates = ase.io.read(template)  # for openmm
             if isinstance(template_or_templates, list):
                 self.template = template_or_templates[0]
@@ -83,53 +216,123 @@ class LogMD:
             self.load_or_create_token()
 
         # Upload using multiple processes
-        self.upload_queue = Queue()
-        self.status_queue = Queue()
+        assert engine in ("process", "async"), f"Unknown engine `{engine}`"
+        assert transport in ("queue", "shm"), f"Unknown transport `{transport}`"
+        self.engine = engine
+        self.transport = transport
+        self.ring: Optional[SharedFrameRing] = None
+        self.shm_bytes = max_queue_bytes if shm_bytes is None else shm_bytes
         self.num_workers = num_workers
         self.upload_processes = []
+        self.pool: Optional[SharedUploadPool] = None
+        self.offline = offline
+        self.spool_dir = f"{self.path}/logmd" if offline and spool is None else spool
+        self.spool: Optional[Spool] = None
+        self.run_log: Optional[RunLog] = None
+        self.compress = compress
+        self.batch_size = batch_size
+        self.linger_ms = linger_ms
+        self.dropped_frames = 0
+        self.dropped_snapshots = 0  # with encode_in_background, dropped before encoding
+        self.last_record_size = 0
 
-        for _ in range(self.num_workers):
-            process = multiprocessing.Process(
-                target=self.upload_worker_process,
-                args=(self.upload_queue, self.status_queue, self.token, self.project),
-            )
-            process.start()
-            self.upload_processes.append(process)
-
-        self.num = self.num_files() + 1
-
-        # If logged-in use <adjective>-<noun>-<num> as name.
-        if self.logged_in:
-            self.run_id = get_run_id(self.num)
-            self.url = f"{get_fe_base_url()}/{self.project}/{self.run_id}"
-        # if not logged in, store publicly, use sha256 hash to remove collision.
-        else:
-            # pr[collision]~1/16^10=1e-12
-            # E[draws to get collision]~sqrt(pr[collision])~1e-5    (birthday paradox)
-            # => we have to check...
-            # TODO: 
-            #   [ ] move hash generation to backend.
-            #   [ ] move upload to signed url  
-            self.run_id = hashlib.sha256(str(time.time()).encode()).hexdigest()[:10]
-            while (
-                httpx.head(f"https://logmd.b-cdn.net/public/{self.run_id}/").status_code
-                == 200
-            ):
-                self.run_id = hashlib.sha256(
-                    str(time.time() + random.random()).encode()
-                ).hexdigest()[:10]
-            self.url = f"{get_fe_base_url()}/{self.run_id}"
+        self.upload_queue = BoundedQueue(max_queue_frames, max_queue_bytes, backpressure, shared=False)
+        self.upload_stats = UploadStats()
+        if not self.offline:
+            if self.engine == "async":
+                self.status_queue = queue.Queue()
+                self.status_collector = StatusCollector(self.status_queue, self.upload_stats)
+                self.status_collector.start()
+                uploader = AsyncUploader(self.upload_queue, self.status_queue, self.batch_size, self.linger_ms)
+                uploader.start()
+                self.upload_processes.append(uploader)
+            else:
+                # worker processes are started with the first frame, see `submit`.
+                self.pool = shared_pool(
+                    batch_size=self.batch_size,
+                    linger_ms=self.linger_ms,
+                    num_workers=num_workers,
+                    min_workers=min_workers,
+                    max_workers=max_workers,
+                    idle_timeout=idle_timeout,
+                )
 
-        if self.store_locally:
-            os.makedirs(f"{self.path}/logmd/{self.run_id}/", exist_ok=True)
+        self.encode_thread: Optional[threading.Thread] = None
+        if encode_in_background:
+            # bounded like the upload queue, full it applies the same backpressure policy.
+            self.snapshots = BoundedQueue(max_queue_frames, max_queue_bytes, backpressure, shared=False)
+            self.snapshot_pool = ArrayPool()
+            self.snapshot_atoms = None
+            self.encode_thread = threading.Thread(target=self.encode_worker, daemon=True)
+            self.encode_thread.start()
 
-        # Print init message with run id.
+        # Public and offline runs get a random id, 64 bits need no collision check.
+        # Logged-in runs are named <adjective>-<noun>-<num>, counting the runs of the
+        # project happens in the background, `run_id` and `url` wait for it.
+        self.num = 0
+        self.run_named = threading.Event()
         rich.print(f"{LOGMD_PREFIX}Load_time=[blue]{time.time() - t0:.2f}s[/] 🚀")
-        rich.print(f"{LOGMD_PREFIX}Url=[blue][link={self.url}]{self.url}[/link][/] 🚀")
+        if self.logged_in and not self.offline:
+            threading.Thread(target=self.name_run, daemon=True).start()
+        else:
+            self.name_run()
 
         # Cleanup asynch processes when python exists.
         atexit.register(self.cleanup)
 
+    def name_run(self) -> None:
+        """Sets `run_id` and `url`, registers the run with the upload pool and prints the url."""
+        try:
+            if self.logged_in and not self.offline:
+                self.num = self.num_files() + 1
+                self._run_id = get_run_id(self.num)
+            else:
+                self._run_id = secrets.token_hex(8)
+            if self.logged_in:
+                self._url = f"{get_fe_base_url()}/{self.project}/{self._run_id}"
+            else:
+                self._url = f"{get_fe_base_url()}/{self._run_id}"
+
+            if self.store_locally:
+                run_dir = f"{self.path}/logmd/{self._run_id}"
+                os.makedirs(run_dir, exist_ok=True)
+                if self.local_format == "memmap":
+                    self.local_store = CoordinateWriter(run_dir)
+                else:
+                    self.local_store = TrajectoryWriter(f"{run_dir}/trajectory.lmdt")
+                self.metrics_store = MetricsWriter(f"{run_dir}/metrics")
+            if self.pool is not None:
+                self.pool.register(self._run_id, self.upload_queue, self.upload_stats)
+            if self.offline:
+                self.run_log = RunLog(f"{self.spool_dir}/{self._run_id}")
+                rich.print(f"{LOGMD_PREFIX}Recording offline to `{self.run_log.path}`")
+            elif self.spool_dir is not None:
+                self.start_spool()
+            rich.print(f"{LOGMD_PREFIX}Url=[blue][link={self._url}]{self._url}[/link][/] 🚀")
+        finally:
+            self.run_named.set()
+
+    def start_spool(self) -> None:
+        self.spool = Spool(self.spool_dir, self._run_id, self.requeue, self.upload_stats)
+        # statuses go through the spool, which acknowledges or retries the frames.
+        if self.pool is not None:
+            for run_id in self.spool.logs:
+                self.pool.route(run_id, self.spool)
+        else:
+            self.status_collector.stats = self.spool
+        if self.spool.resumed:
+            rich.print(f"{LOGMD_PREFIX}Resuming=[blue]{self.spool.resumed}[/] frames from `{self.spool_dir}`")
+
+    @property
+    def run_id(self) -> str:
+        self.run_named.wait()
+        return self._run_id
+
+    @property
+    def url(self) -> str:
+        self.run_named.wait()
+        return self._url
+
     @property
     def logged_in(self) -> bool:
         return self.token is not None
@@ -141,58 +344,117 @@ class LogMD:
         self.token = load_token()
 
     def cleanup(self) -> None:
+        if self.encode_thread is not None:
+            self.snapshots.stop()
+            self.encode_thread.join()
+        if self.local_store is not None:
+            self.local_store.close()
+            self.local_store = None
+        if self.metrics_store is not None:
+            self.metrics_store.close()
+            self.metrics_store = None
+
+        if self.offline:
+            atexit.unregister(self.cleanup)
+            if self.run_log is not None:
+                self.run_log.close()
+                self.run_log = None
+                rich.print(f"{LOGMD_PREFIX}Recorded=[blue]{self.frame_num}[/] frames, upload them with `logmd sync {self.spool_dir}`")
+            return
+
         rich.print(
             f"{LOGMD_PREFIX}Finishing uploads (if >5s open issue [link=https://github.com/log-md/logmd]https://github.com/log-md/logmd[/link] )"
         )
 
-        # Send termination signal to all worker processes
-        for _ in range(self.num_workers):
-            self.upload_queue.put(None)
-        for process in self.upload_processes:
-            process.join()
+        # Retry failed frames while the backend is reachable, the rest stays in the spool.
+        if self.spool is not None:
+            deadline = time.monotonic() + 30
+            while time.monotonic() < deadline and (
+                self.spool.retrying()
+                or self.upload_stats.completed + self.dropped_frames < self.upload_stats.submitted
+            ):
+                time.sleep(0.05)
+
+        # Wait for the uploads of this run, the shared pool keeps running for other runs.
+        if self.pool is not None:
+            left = self.pool.flush(self.run_id, self.dropped_frames)
+            if left:
+                rich.print(f"{LOGMD_PREFIX}[yellow]Stopped waiting for [blue]{left}[/] frames, no upload finished for 60s[/]")
+            self.pool.unregister(self.run_id)
+            for run_id in self.spool.logs if self.spool is not None else ():
+                self.pool.unregister(run_id)
+        else:
+            for _ in self.upload_processes:
+                self.upload_queue.stop()
+            for process in self.upload_processes:
+                process.join()
+            self.status_collector.stop()
+        atexit.unregister(self.cleanup)
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+        if self.spool is not None:
+            left = self.spool.close()
+            if left:
+                rich.print(f"{LOGMD_PREFIX}[yellow]Spooled=[blue]{left}[/] frames not uploaded yet, in `{self.spool_dir}`[/]")
+            self.spool = None
 
         # Zip and upload local files if requested
         #if self.store_locally and self.zip:
         #    #self.zip_and_upload_local_files()
 
+        if self.dropped_frames + self.dropped_snapshots > 0:
+            dropped = self.dropped_frames + self.dropped_snapshots
+            rich.print(f"{LOGMD_PREFIX}[yellow]Dropped=[blue]{dropped}[/] frames ({self.upload_queue.policy})[/]")
+        stats = self.stats()
+        if stats["errors"] > 0:
+            rich.print(f"{LOGMD_PREFIX}[red]Failed uploads=[blue]{stats['errors_by_status']}[/] (status: count)[/]")
+        if self.compress and stats["raw_bytes"] > 0:
+            saved = stats["raw_bytes"] - stats["sent_bytes"]
+            rich.print(f"{LOGMD_PREFIX}Uploaded=[blue]{stats['sent_bytes'] / 1e6:.2f}MB[/] saved=[blue]{saved / 1e6:.2f}MB[/] by compression")
+        if self.frame_format == "binary" and self.encoder.encoded_bytes > 0:
+            rich.print(f"{LOGMD_PREFIX}Compression_ratio=[blue]{self.encoder.compression_ratio:.1f}x[/]")
 
         rich.print(f"{LOGMD_PREFIX}Url=[blue]{self.url}[/] ✅")
 
-    @staticmethod
-    def upload_worker_process(
-        upload_queue: Queue, status_queue: Queue, token: LogMDToken, project: str
-    ) -> None:
-        """Worker process that handles uploads"""
-        client = httpx.Client(timeout=180)
-
-        while True:
-            item = upload_queue.get()
-            if item is None:
-                break
-            atom_string, frame_num, run_id, data_dict = item
+    def stats(self, show: bool = False) -> dict:
+        """
+        Upload telemetry of this run: frames/s, bytes/s, queue depth, in-flight
+        frames, p50/p95/p99 upload latency (seconds), error counts, the number of
+        upload workers and their scaling events `(time, "start" | "retire", workers)`.
 
-            url = get_upload_url()
-            data = {
-                "user_id": "public" if token is None else token.email,
-                "run_id": run_id,
-                "frame_num": str(frame_num),
-                "file_contents": atom_string,
-                "token": None if token is None else token.token,
-                "project": project,
-                "data_dict": data_dict,
-            }
-            response = client.post(url, json=data)
-            status_queue.put((frame_num, response.status_code))
-        client.close()
+        Args:
+            show: also print a compact status line.
+        """
+        stats = self.upload_stats.summary(self.upload_queue.qsize(), self.dropped_frames)
+        stats["dropped"] += self.dropped_snapshots
+        if self.pool is not None:
+            stats["workers"] = self.pool.workers.size
+            stats["scaling_events"] = list(self.pool.workers.events)
+        if show:
+            rich.print(status_line(stats))
+        return stats
 
     # for openmm
     def describeNextReport(self, simulation):
         """
-        FIXME: according to openmm docs, this should return a dict of
+        What OpenMM has to copy from the platform for the next report: positions,
+        the energies with `openmm_energies` and the velocities/forces channels.
+        Returns the dict of OpenMM >= 8.1, the 5-tuple before.
         http://docs.openmm.org/latest/api-python/generated/openmm.app.checkpointreporter.CheckpointReporter.html?highlight=describenextreport
         """
-        steps = self.interval
-        return (steps, True, True, True, False)
+        import openmm  # type: ignore[import-untyped]
+
+        steps = self.interval - simulation.currentStep % self.interval
+        include = ["positions"]
+        for name in ("velocities", "forces"):
+            if name in self.channel_encoders:
+                include.append(name)
+        if self.openmm_energies:
+            include.append("energy")
+        if tuple(int(part) for part in openmm.version.short_version.split(".")[:2]) >= (8, 1):
+            return {"steps": steps, "include": include}
+        return (steps, *(name in include for name in ("positions", "velocities", "forces", "energy")))
 
     # for openmm
     def report(self, simulation, state) -> None:
@@ -201,13 +463,49 @@ class LogMD:
         simulation.reporters.append(LogMD(template='1crn.pdb', interval=100)).
         http://docs.openmm.org/latest/api-python/generated/openmm.app.checkpointreporter.CheckpointReporter.html?highlight=describenextreport#openmm.app.checkpointreporter.CheckpointReporter.report
         """
+        from openmm import unit  # type: ignore[import-untyped]
+
         self.template.positions = state.getPositions(asNumpy=True).value_in_unit(
             unit.angstrom
         )
-        self.__call__(self.template)
+        metrics = {}
+        if self.openmm_energies:
+            potential = state.getPotentialEnergy().value_in_unit(unit.kilojoule_per_mole)
+            kinetic = state.getKineticEnergy().value_in_unit(unit.kilojoule_per_mole)
+            if self.openmm_dof is None:
+                self.openmm_dof = self.degrees_of_freedom(simulation.system)
+            gas_constant = unit.MOLAR_GAS_CONSTANT_R.value_in_unit(unit.kilojoule_per_mole / unit.kelvin)
+            metrics["energy"] = (potential * kJ_per_mol_to_eV, "eV")
+            metrics["kinetic_energy"] = (kinetic * kJ_per_mol_to_eV, "eV")
+            metrics["temperature"] = (2 * kinetic / (max(self.openmm_dof, 1) * gas_constant), "K")
+            metrics["simulation_time"] = (state.getTime().value_in_unit(unit.picosecond), "ps")
+        channels = {}
+        if "velocities" in self.channel_encoders:
+            channels["velocities"] = state.getVelocities(asNumpy=True).value_in_unit(unit.angstrom / unit.femtosecond)
+        if "forces" in self.channel_encoders:
+            forces = state.getForces(asNumpy=True).value_in_unit(unit.kilojoule_per_mole / unit.angstrom)
+            channels["forces"] = forces * kJ_per_mol_to_eV
+        self.__call__(self.template, channels=channels, metrics=metrics)
+
+    @staticmethod
+    def degrees_of_freedom(system) -> int:
+        """Degrees of freedom of an OpenMM system, as counted by `StateDataReporter`."""
+        import openmm  # type: ignore[import-untyped]
+
+        massive = [
+            system.getParticleMass(i).value_in_unit(openmm.unit.dalton) > 0 for i in range(system.getNumParticles())
+        ]
+        dof = 3 * sum(massive)
+        for i in range(system.getNumConstraints()):
+            p1, p2, _ = system.getConstraintParameters(i)
+            if massive[p1] or massive[p2]:
+                dof -= 1
+        if any(isinstance(system.getForce(i), openmm.CMMotionRemover) for i in range(system.getNumForces())):
+            dof -= 3
+        return dof
 
     @staticmethod
-    def mdanalysis(u, fun=None, display_notebook=False):
+    def mdanalysis(u, fun=None, display_notebook=False, frame_format="pdb", keyframe_interval=10, max_error=None):
         """ Example: 
         ```
             import MDAnalysis as mda
@@ -215,17 +513,36 @@ class LogMD:
             u=mda.Universe('topology.pdb', 'samples.xtc')
             LogMD.mdanalysis(u)
         ```
+
+        With `frame_format="binary"` the zip holds the topology once, the frames as
+        keyframes/deltas (see `logmd.codec`) and the data_dict of each frame as json lines.
+        `max_error` (Angstrom) stores the frames lossy and implies `frame_format="binary"`.
         """
+        import ase.io
+        from tqdm import tqdm
+
         url = 'https://alexander-mathiasen--logmd-upload-single-file-dev.modal.run' if is_dev() else 'https://alexander-mathiasen--logmd-upload-single-file.modal.run'
         
         atoms = ase.io.read(u.filename)
         output_buffer = io.StringIO()
+        frame_buffer = io.BytesIO()
+        encoder = FrameEncoder(keyframe_interval, max_error)
+        if max_error is not None:
+            frame_format = "binary"
+        if frame_format == "binary":
+            encoder.set_topology(LogMD.ase_pdb_string(atoms))
 
 
         for frame_idx in tqdm(range(len(u.trajectory)), desc="Processing frames"):
             u.trajectory[frame_idx]
             atoms.positions = u.atoms.positions
 
+            if frame_format == "binary":
+                data_dict = {} if fun is None else fun(atoms)
+                output_buffer.write(json.dumps(data_dict) + "\n")
+                frame_buffer.write(encoder.encode_bytes(pdb_positions(atoms), frame_idx + 1))
+                continue
+
             header = ""
             if fun is not None:
                 data_dict = fun(atoms)
@@ -237,12 +554,17 @@ class LogMD:
             
         zip_buffer = io.BytesIO()
         with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=5) as zip_file:
-            zip_file.writestr('trajectory_analysis.pdb', output_buffer.getvalue().encode('utf-8'))
+            if frame_format == "binary":
+                zip_file.writestr('topology.pdb', encoder.topology.pdb_string.encode('utf-8'))
+                zip_file.writestr('trajectory_analysis.lmd', frame_buffer.getvalue())
+                zip_file.writestr('data.jsonl', output_buffer.getvalue().encode('utf-8'))
+                rich.print(f"{LOGMD_PREFIX}Compression_ratio=[blue]{encoder.compression_ratio:.1f}x[/]")
+            else:
+                zip_file.writestr('trajectory_analysis.pdb', output_buffer.getvalue().encode('utf-8'))
         
         base64_encoded = base64.b64encode(zip_buffer.getvalue()).decode('ascii')
         
         def data_generator():
-            import json
             json_str = json.dumps({"file_contents": base64_encoded}).encode('utf-8')
             total_size = len(json_str)
             chunk_size = min(4096, total_size // 100)
@@ -273,81 +595,340 @@ class LogMD:
         return url
 
     @staticmethod
-    def pytraj(traj, fun=None, display_notebook=False):
+    def pytraj(traj, fun=None, display_notebook=False, frame_format="pdb", keyframe_interval=10, max_error=None):
+        import ase.io
+
         if not traj.top.filename.endswith('.pdb'):
             print(f"Only support `topology.pdb` not `{traj.top.filename}`")
             print("Please open an issue at https://github.com/log-md/logmd/issues")
-        logmd = LogMD()
+        logmd = LogMD(frame_format=frame_format, keyframe_interval=keyframe_interval, max_error=max_error)
         if display_notebook: logmd.notebook()
         atoms = ase.io.read(traj.top.filename)
         for frame in traj: 
             atoms.set_positions(frame.xyz)
-            logmd(atoms, data_dict=fun(atoms))
+            logmd(atoms, data_dict=None if fun is None else fun(atoms))
             time.sleep(.1)
 
 
     # for ase
-    def __call__(self, atoms, dyn=None, data_dict=None, calc=False):
+    def __call__(self, atoms, dyn=None, data_dict=None, calc=False, channels=None, metrics=None):
         """
         Method ASE calls:
         logmd = LogMD()
         dyn.attach(logmd)
+
+        `channels` maps channel names to per-atom arrays, overriding the ones taken
+        from `atoms` (see the `channels` argument of `LogMD`). `metrics` maps names
+        to `(value, unit)`, e.g. the energies of the OpenMM state, overriding the
+        ones computed from `atoms` and `dyn`.
         """
-        if data_dict is None:
-            data_dict = {}
+        # a copy, encoding adds to it, possibly on the encode thread.
+        data_dict = {} if data_dict is None else dict(data_dict)
         self.frame_num += 1
-        energy = 0 
+        given, metrics = metrics or {}, {}
+
+        if type(atoms) != str:
+            if "energy" not in given:
+                energy = float(atoms.get_potential_energy()) if atoms.calc is not None else 0
+                metrics["energy"] = (energy, "eV")
+            if dyn is not None:
+                from ase import units
+
+                simulation_time, temperature = dyn.get_time()/units.fs, dyn.temp * eV_to_K
+                metrics["simulation_time"] = (simulation_time, "ps")
+                metrics["temperature"] = (temperature, "K")
+        metrics.update(given)
+        channels = self.channel_values(atoms, channels) if self.channel_encoders else {}
+
+        if self.encode_thread is None:
+            self.encode(Snapshot(self.frame_num, atoms, None, None, None, metrics, data_dict, calc, channels))
+            return
+
+        # only copy what changes per frame, encoding happens on the encode thread.
+        if type(atoms) == str:
+            snapshot = Snapshot(self.frame_num, atoms, None, None, None, metrics, data_dict, calc, channels)
+        else:
+            if self.snapshot_atoms is None or len(self.snapshot_atoms) != len(atoms):
+                self.snapshot_atoms = atoms.copy()
+            snapshot = Snapshot(
+                self.frame_num,
+                self.snapshot_atoms,
+                self.snapshot_pool.copy(atoms.positions),
+                atoms.cell.array.copy(),
+                atoms.pbc.copy(),
+                metrics,
+                data_dict,
+                calc,
+                channels,
+            )
+        nbytes = len(atoms) if snapshot.positions is None else snapshot.positions.nbytes
+        for dropped in self.snapshots.put(snapshot, nbytes):
+            self.dropped_snapshots += 1
+            if dropped.positions is not None:
+                self.snapshot_pool.release(dropped.positions)
+
+    def channel_values(self, atoms, channels: Optional[dict]) -> dict:
+        """Copies of the configured per-atom channels, from `channels` or else from `atoms`."""
+        values = {}
+        for name in self.channel_encoders:
+            if channels is not None and name in channels:
+                values[name] = np.array(channels[name], dtype=np.float64)
+            elif type(atoms) == str:
+                continue
+            elif name == "forces" and atoms.calc is not None:
+                values[name] = atoms.get_forces()
+            elif name == "velocities":
+                from ase import units
+
+                values[name] = atoms.get_velocities() * units.fs
+            elif name == "charges":
+                try:
+                    values[name] = atoms.get_charges()
+                except (RuntimeError, NotImplementedError):  # no calculator or it has no charges
+                    values[name] = atoms.get_initial_charges()
+        return values
+
+    def encode_worker(self) -> None:
+        """Encodes the snapshots `__call__` queues with `encode_in_background=True`."""
+        while True:
+            snapshot = self.snapshots.get()
+            if snapshot is None:
+                break
+            try:
+                self.encode(snapshot)
+            except Exception as e:
+                rich.print(f"{LOGMD_PREFIX}[red]Error while encoding frame {snapshot.frame_num}: `[dim]{str(e)}[/]`")
+
+    def encode(self, snapshot: "Snapshot") -> None:
+        """Turn a snapshot into an upload record, store it locally if requested and submit it."""
+        frame_num, atoms, data_dict, calc = snapshot.frame_num, snapshot.atoms, snapshot.data_dict, snapshot.calc
+        metrics = dict(snapshot.metrics)
+        record = None
+        atom_string = ""  # only rendered when uploaded or stored as pdb
+
+        if snapshot.positions is not None:
+            atoms.positions = snapshot.positions
+            atoms.cell = snapshot.cell
+            atoms.pbc = snapshot.pbc
+            self.snapshot_pool.release(snapshot.positions)
 
         if type(atoms) == str: 
             atom_string, vals = fix_pdb_bfactor_string(atoms) 
-            data_dict.update( {
-                "confidence": f"{sum(vals)/len(vals)} [0-100]",
-            })
+            metrics["confidence"] = (sum(vals)/len(vals), "0-100")
+            energy = 0
             if calc:
                 # read atoms from pdb_string, add calc and compute enregy 
+                import ase.io
+
                 atoms = ase.io.read(io.StringIO(clean_for_ASE(atom_string)), format='proteindatabank')
                 atoms.calc = calc
                 energy = float(atoms.get_potential_energy())
+            metrics["energy"] = (energy, "eV")
         
         else: 
-            if atoms.calc is not None: energy = float(atoms.get_potential_energy())
+            if self.frame_format == "binary":
+                if self.upload_queue.policy in ("drop_oldest", "coalesce") and self.upload_queue.full(self.last_record_size):
+                    # the pending frames this frame would refer to are about to be dropped.
+                    self.encoder.force_keyframe()
+                    self.encoder.resend_topology()
+                positions = atoms.positions if self.pdb != "" else pdb_positions(atoms)
+                topology = self.encoder.topology
+                if topology is None or len(topology) != len(atoms):
+                    self.encoder.set_topology(self.ase_pdb_string(atoms))
+                record = self.encoder.encode(positions, frame_num, None if self.pdb != "" else cryst1_line(atoms))
+            if record is None or (self.store_locally and self.local_format == "pdb"):
+                if self.pdb != "":
+                    atom_string = self.pdb_template.render(atoms.positions)
+                else:
+                    atom_string = self.ase_pdb_string(atoms)
 
-            if dyn is not None:
-                simulation_time, temperature = dyn.get_time()/units.fs, dyn.temp * eV_to_K
-                data_dict.update(
-                    {
-                        "simulation_time": f"{simulation_time} [ps]",
-                        "temperature": f"{temperature} [K]",
-                    }
-                )
+        if record is None:
+            record = {"file_contents": atom_string}
 
-            if self.pdb != "":
-                atom_string = update_pdb_positions(self.pdb, atoms.positions)
-            else: 
-                temp_pdb = io.StringIO()
-                ase.io.write(temp_pdb, atoms, format="proteindatabank")
-                atom_string = temp_pdb.getvalue()
-                temp_pdb.close()
+        for name, values in snapshot.channels.items():
+            if CHANNEL_WIDTHS[name] == 3 and self.pdb == "" and type(atoms) != str and atoms.pbc.any():
+                # vectors in the frame of the pdb coordinates, see `pdb_positions`.
+                values = values.dot(atoms.cell.standard_form()[1].T)
+            record[name] = self.channel_encoders[name].encode(values, frame_num)
 
         if self.store_locally:
-            try: 
-                free_space = os.statvfs(self.path).f_frsize * os.statvfs(self.path).f_bavail
-                if free_space >= 1000000000:  
-                    with open(f"{self.path}/logmd/{self.run_id}/{self.frame_num}.pdb", "w") as f:
-                        f.write(atom_string)
-                else:
-                    if not self.disk_space_warning_shown:
-                        rich.print(f"{LOGMD_PREFIX}[yellow]Warning: Less than 1GB free space available. Skipping local storage.[/]")
-                        self.disk_space_warning_shown = True
-            except: 
-                pass 
+            self.store_frame(frame_num, atoms, atom_string)
+            self.store_metrics(frame_num, metrics, data_dict)
 
-        data_dict.update(
+        if self.rollups is not None:
+            numbers = {}
+            for key, value in {**data_dict, **metrics}.items():
+                parsed = numeric(value)
+                if parsed is not None:
+                    numbers[key] = parsed[0]
+            buckets = self.pending_rollups + self.rollups.add(frame_num, numbers)
+            self.pending_rollups = []
+            if buckets:
+                record["rollups"] = buckets
+        if (frame_num - 1) % self.metrics_interval:
+            # the numeric metrics of this frame are only in the rollups.
+            record["data_dict"] = {key: value for key, value in data_dict.items() if numeric(value) is None}
+        elif self.metrics_encoder is not None:
+            record.update(self.metrics_encoder.encode({**data_dict, **metrics}))
+        else:
+            data_dict.update({key: f"{value} [{unit}]" for key, (value, unit) in metrics.items()})
+            record["data_dict"] = data_dict
+        record.update(
             {
-                "energy": f"{energy} [eV]",
+                "run_id": self.run_id,
+                "frame_num": str(frame_num),
             }
         )
-        self.upload_queue.put((atom_string, self.frame_num, self.run_id, data_dict))
+        self.submit(record)
+
+    def store_frame(self, frame_num: int, atoms, atom_string: str) -> None:
+        """Append a frame to the local trajectory or coordinate store, see `logmd.trajectory` and `logmd.local`."""
+        self.run_named.wait()
+        if self.local_store is None:
+            return
+        try:
+            if self.local_format == "pdb":
+                stored = self.local_store.append(frame_num, atom_string)
+            elif type(atoms) == str:
+                stored = self.local_store.append(frame_num, pdb_string_positions(atom_string), topology=atom_string)
+            else:
+                # store what the pdb would hold, periodic systems rotated into the standard form of the cell.
+                positions, cell = atoms.positions, atoms.cell.array
+                if self.pdb == "" and atoms.pbc.any():
+                    cell, rotation = atoms.cell.standard_form()
+                    positions, cell = positions.dot(rotation.T), cell.array
+                topology = "" if self.local_store.num_atoms else self.pdb or self.ase_pdb_string(atoms)
+                stored = self.local_store.append(frame_num, positions, cell, topology)
+        except (OSError, ValueError) as e:
+            rich.print(f"{LOGMD_PREFIX}[yellow]Warning: Local storage failed (`{e}`), skipping it from now on.[/]")
+            self.local_store = None
+            return
+        if not stored and not self.disk_space_warning_shown:
+            rich.print(f"{LOGMD_PREFIX}[yellow]Warning: Less than 1GB free space available. Skipping local storage.[/]")
+            self.disk_space_warning_shown = True
+
+    def store_metrics(self, frame_num: int, metrics: dict, data_dict: dict) -> None:
+        """Append the scalars of a frame to the local metrics table, see `logmd.metrics`."""
+        if self.metrics_store is None:
+            return
+        try:
+            self.metrics_store.append(frame_num, {**data_dict, **metrics})
+        except OSError as e:
+            rich.print(f"{LOGMD_PREFIX}[yellow]Warning: Storing metrics failed (`{e}`), skipping it from now on.[/]")
+            self.metrics_store = None
+
+    @staticmethod
+    def open_local(run_id: str, path: str = "") -> LocalRun:
+        """
+        Open a run stored with `store_locally=True, local_format="memmap"` in
+        `<path>/logmd/<run_id>` (default: the working directory) for random access,
+        e.g. `LogMD.open_local(run_id)[::10]`. See `LocalRun`.
+        """
+        return LocalRun(os.path.join(path or os.getcwd(), "logmd", run_id))
+
+    @staticmethod
+    def open_metrics(run_id: str, path: str = "") -> MetricsTable:
+        """
+        Open the metrics of a run stored with `store_locally=True` in
+        `<path>/logmd/<run_id>/metrics`, e.g. `LogMD.open_metrics(run_id)["energy"]`
+        is a NumPy array with the energy of every frame. See `MetricsTable`.
+        """
+        return MetricsTable(os.path.join(path or os.getcwd(), "logmd", run_id, "metrics"))
+
+    def submit(self, record: dict) -> None:
+        """Put `record` on the upload queue, applying the backpressure policy."""
+        if self.run_log is not None:
+            self.run_log.append(self.project, record)
+            return
+        if self.spool is not None and not self.spool.append(record, self.project):
+            return  # uploads are failing, the spool replays it later.
+        self.last_record_size = record_size(record)
+        self.upload_stats.submit()
+        record["_request"] = (self.token, self.project, self.compress)
+        dependent = self.needs_queued_header(record) or is_delta(record)
+        dropped = self.upload_queue.put(self.shared_memory_record(record), self.last_record_size, dependent)
+        self.handle_dropped(dropped)
+        if self.pool is not None:
+            self.pool.notify()
+
+    def requeue(self, record: dict, project: str) -> None:
+        """Queue a frame the spool retries, it never displaces queued frames."""
+        size = record_size(record)
+        if self.upload_queue.full(size):
+            self.spool.defer(record)
+            return
+        self.upload_stats.submit()
+        record["_request"] = (self.token, project, self.compress)
+        dependent = self.needs_queued_header(record) or is_delta(record)
+        self.handle_dropped(self.upload_queue.put(record, size, dependent))
+        if self.pool is not None:
+            self.pool.notify()
+
+    def needs_queued_header(self, record: dict) -> bool:
+        """
+        Whether the topology or metrics schema `record` is decoded with was sent with a
+        record that is still queued. Dropping that record must drop `record` too.
+        """
+        queued = self.upload_queue.qsize()
+        needs = False
+        for field in ("topology", "metrics_schema"):
+            if field in record:
+                self.header_puts[field] = 0
+            elif field in self.header_puts:
+                # the queue is FIFO, the record carrying it is queued while more frames are than were put after it.
+                needs = needs or queued > self.header_puts[field]
+                self.header_puts[field] += 1
+        return needs
+
+    def handle_dropped(self, dropped: list) -> None:
+        for item in dropped:
+            if "_slot" in item and self.ring is not None:
+                self.ring.release(item)
+            if "topology" in item:
+                self.encoder.resend_topology()
+            if "metrics_schema" in item:
+                self.metrics_encoder.resend_schema()
+            if self.spool is not None:
+                self.spool.defer(item)
+            elif "rollups" in item:
+                self.pending_rollups.extend(item["rollups"])
+        if dropped:
+            self.dropped_frames += len(dropped)
+            # frames after a dropped one can not be deltas to it.
+            self.encoder.force_keyframe()
+            for encoder in self.channel_encoders.values():
+                encoder.force_keyframe()
+
+    def shared_memory_record(self, record: dict) -> dict:
+        """With transport="shm" move the payload of `record` into the shared memory ring."""
+        if self.transport != "shm" or self.engine != "process":
+            return record
+        if self.ring is None:
+            # size slots after the first frame, leaving room for growth.
+            slot_size = 2 * max(len(record.get("frame") or record.get("file_contents", "")), 1 << 16)
+            budget = self.shm_bytes
+            if os.path.isdir("/dev/shm"):
+                budget = min(budget, shutil.disk_usage("/dev/shm").free // 2)
+            num_slots = min(max(8, 4 * self.pool.workers.max_workers * self.batch_size), budget // (1 + slot_size))
+            try:
+                if num_slots < 1:
+                    raise OSError(f"{budget} bytes of shared memory do not hold a slot of {slot_size} bytes")
+                self.ring = SharedFrameRing(num_slots, slot_size)
+            except OSError as e:
+                rich.print(f"{LOGMD_PREFIX}[yellow]Warning: no shared memory ring (`{e}`), using transport=\"queue\".[/]")
+                self.transport = "queue"
+                return record
+        return self.ring.put(record)
+
+    @staticmethod
+    def ase_pdb_string(atoms) -> str:
+        import ase.io
+
+        temp_pdb = io.StringIO()
+        ase.io.write(temp_pdb, atoms, format="proteindatabank")
+        atom_string = temp_pdb.getvalue()
+        temp_pdb.close()
+        return atom_string
 
     def num_files(self) -> int:
         """Returns the number of files in the current project."""
@@ -409,10 +990,13 @@ class LogMD:
         - in that file user has naming convenction `orbff = ..` and `calc = ..(orbff)`
         - user sends a dynamics object from ASE.  
         '''
-        if key is None: return 
+        if key is None: return
+ 
 
         import inspect
         import dill 
+        import requests
+        from tqdm import tqdm
 
         url = "https://alexander-mathiasen--orb-run-md.modal.run"
         #url = "https://alexander-mathiasen--orb-run-md-dev.modal.run"
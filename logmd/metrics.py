@@ -0,0 +1,373 @@
+"""
+Columnar local store of the per-frame scalars (energy, temperature,
+simulation_time, confidence and the numeric values of `data_dict`), written
+to `logmd/<run_id>/metrics/` with `store_locally=True`.
+
+Every column is a file of little-endian values, `frame_num.i8` plus one
+`<name>.<dtype>` per metric, all with one row per frame. `schema.json` holds the
+dtype and unit of each column. A column starts as int64 if its first value is
+an integer and becomes float64 once a value is fractional or missing, missing
+values are NaN. A column that appears later is NaN for the earlier frames.
+
+Rows are buffered and appended in chunks. A table is as long as its shortest
+column, so a run whose process died is readable up to its last chunk.
+
+With `metrics_format="packed"` the same scalars are uploaded as a typed
+vector instead of `"<value> [<unit>]"` strings in `data_dict`: the schema,
+`[[name, dtype, unit], ...]`, is attached to the first record and again
+whenever it changes, every record carries the values as little-endian bytes
+in schema order (`MetricsEncoder`, `MetricsDecoder`).
+
+With `rollups=True` every metric is also aggregated into power-of-two buckets
+(`MetricRollups`), so plots of runs with millions of frames can load a coarse
+level instead of every sample, and `metrics_interval` can thin out the raw
+samples.
+"""
+
+import base64
+import json
+import math
+import os
+import re
+import struct
+import time
+from typing import Optional
+from urllib.parse import quote
+
+import numpy as np
+
+SCHEMA, FRAME_NUM = "schema.json", "frame_num"
+INT, FLOAT = "<i8", "<f8"
+VALUE_WITH_UNIT = re.compile(r"^\s*([-+0-9.eEinfINFa]+)\s*\[(.*)\]\s*$")
+
+
+def numeric(value) -> Optional[tuple]:
+    """Returns `(value, unit)` of a number, `(number, unit)` or `"<number> [unit]"` string, else None."""
+    unit = ""
+    if isinstance(value, tuple) and len(value) == 2:
+        value, unit = value
+    elif isinstance(value, str):
+        match = VALUE_WITH_UNIT.match(value)
+        if match is None:
+            return None
+        value, unit = match.groups()
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+    if isinstance(value, (bool, np.bool_)):
+        return int(value), unit
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return value, unit
+    return None
+
+
+def _column_file(name: str, dtype: str) -> str:
+    return f"{quote(name, safe='')}.{np.dtype(dtype).kind}{np.dtype(dtype).itemsize}"
+
+
+class MetricsWriter:
+    """
+    Appends one row per frame to the metrics table in `path`, columns are
+    written every `chunk_rows` rows or `flush_interval` seconds.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = 1024, flush_interval: float = 10.0):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.flush_interval = flush_interval
+        self.schema: dict = {}  # name -> {"dtype", "unit"}
+        self.rows = 0  # written rows
+        if os.path.exists(os.path.join(path, SCHEMA)):
+            with open(os.path.join(path, SCHEMA)) as f:
+                self.schema = json.load(f)["columns"]
+            self.rows = _num_rows(path, self.schema)
+            # drop the rows of a chunk an earlier process did not finish.
+            for name, dtype in self._columns():
+                file = os.path.join(path, _column_file(name, dtype))
+                if os.path.exists(file):
+                    os.truncate(file, self.rows * 8)
+        else:
+            self._write_schema()
+        self.buffer: dict = {FRAME_NUM: []}  # name -> values of the buffered rows
+        self.last_flush = time.monotonic()
+
+    def append(self, frame_num: int, values: dict) -> None:
+        """Adds a row, `values` maps names to numbers, `(number, unit)` or `"<number> [unit]"`, others are skipped."""
+        row = len(self.buffer[FRAME_NUM])
+        self.buffer[FRAME_NUM].append(frame_num)
+        for name, value in values.items():
+            parsed = numeric(value)
+            if parsed is None or name == FRAME_NUM:
+                continue
+            value, unit = parsed
+            if name not in self.schema:
+                self._add_column(
+                    name, INT if isinstance(value, (int, np.integer)) else FLOAT, unit
+                )
+            column = self.buffer.setdefault(name, [])
+            column.extend([np.nan] * (row - len(column)))
+            column.append(value)
+
+        if (
+            row + 1 >= self.chunk_rows
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def _add_column(self, name: str, dtype: str, unit: str) -> None:
+        self.schema[name] = {"dtype": dtype, "unit": unit}
+        if self.rows:
+            self._write(name, np.full(self.rows, np.nan))
+        self._write_schema()
+
+    def _columns(self) -> list:
+        return [(FRAME_NUM, INT)] + [
+            (name, column["dtype"]) for name, column in self.schema.items()
+        ]
+
+    def _write(self, name: str, values) -> None:
+        dtype = self.schema[name]["dtype"] if name != FRAME_NUM else INT
+        values = np.asarray(values, dtype=np.float64 if dtype == FLOAT else None)
+        if dtype == INT and (
+            values.dtype.kind == "f" and not np.array_equal(values, np.round(values))
+        ):
+            self._promote(name)
+            dtype = FLOAT
+        with open(os.path.join(self.path, _column_file(name, dtype)), "ab") as f:
+            f.write(values.astype(dtype).tobytes())
+
+    def _promote(self, name: str) -> None:
+        """Rewrite an int64 column as float64."""
+        old = os.path.join(self.path, _column_file(name, INT))
+        values = (
+            np.fromfile(old, dtype=INT)[: self.rows]
+            if os.path.exists(old)
+            else np.zeros(0)
+        )
+        with open(os.path.join(self.path, _column_file(name, FLOAT)), "wb") as f:
+            f.write(values.astype(FLOAT).tobytes())
+        self.schema[name]["dtype"] = FLOAT
+        self._write_schema()
+        if os.path.exists(old):
+            os.remove(old)
+
+    def _write_schema(self) -> None:
+        tmp = os.path.join(self.path, SCHEMA + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"columns": self.schema}, f)
+        os.replace(tmp, os.path.join(self.path, SCHEMA))
+
+    def flush(self) -> None:
+        rows = len(self.buffer[FRAME_NUM])
+        if rows:
+            for name in self.schema:
+                column = self.buffer.get(name, [])
+                self._write(name, column + [np.nan] * (rows - len(column)))
+            # the frame_num column last, it decides which rows are complete.
+            self._write(FRAME_NUM, self.buffer[FRAME_NUM])
+            self.rows += rows
+            self.buffer = {FRAME_NUM: []}
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+
+
+def _num_rows(path: str, schema: dict) -> int:
+    sizes = []
+    for name, dtype in [(FRAME_NUM, INT)] + [
+        (name, column["dtype"]) for name, column in schema.items()
+    ]:
+        file = os.path.join(path, _column_file(name, dtype))
+        sizes.append(os.path.getsize(file) // 8 if os.path.exists(file) else 0)
+    return min(sizes)
+
+
+class MetricsTable:
+    """
+    Read-only view of a metrics table, `table["energy"]` is a NumPy array
+    (a memory map) with one value per frame, `table.units["energy"]` its unit.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, SCHEMA)) as f:
+            schema = json.load(f)["columns"]
+        self.rows = _num_rows(path, schema)
+        self.dtypes = {name: column["dtype"] for name, column in schema.items()}
+        self.units = {name: column["unit"] for name, column in schema.items()}
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.dtypes or name == FRAME_NUM
+
+    @property
+    def columns(self) -> list:
+        return list(self.dtypes)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        dtype = INT if name == FRAME_NUM else self.dtypes[name]
+        if self.rows == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(
+            os.path.join(self.path, _column_file(name, dtype)),
+            dtype,
+            "r",
+            shape=(self.rows,),
+        )
+
+    @property
+    def frame_nums(self) -> np.ndarray:
+        return self[FRAME_NUM]
+
+    def to_dict(self) -> dict:
+        return {name: self[name] for name in [FRAME_NUM, *self.columns]}
+
+
+class MetricsEncoder:
+    """
+    Splits the scalars of a frame into a packed typed vector and the remaining
+    (non-numeric) `data_dict`. Metrics are added to the schema when they first
+    appear, an int64 metric becomes float64 once a value is not an integer or
+    missing, missing float64 values are NaN. Both change the schema, which is
+    then attached to the next record.
+    """
+
+    def __init__(self):
+        self.schema: list = []  # [name, dtype, unit]
+        self.columns: dict = {}  # name -> position in the schema
+        self.packer = struct.Struct("<")
+        self._schema_sent = False
+
+    def resend_schema(self) -> None:
+        """Attach the schema to the next record again, e.g. after it was dropped."""
+        self._schema_sent = False
+
+    def encode(self, values: dict) -> dict:
+        """Returns the record fields `metrics` (bytes), `data_dict` and `metrics_schema` if it changed."""
+        numbers, data_dict = {}, {}
+        for name, value in values.items():
+            parsed = numeric(value)
+            if parsed is None:
+                data_dict[name] = value
+            else:
+                numbers[name] = parsed
+
+        changed = False
+        for name, (value, unit) in numbers.items():
+            if name not in self.columns:
+                self.columns[name] = len(self.schema)
+                self.schema.append(
+                    [name, INT if isinstance(value, (int, np.integer)) else FLOAT, unit]
+                )
+                changed = True
+        row = [numbers.get(name, (np.nan, ""))[0] for name, _, _ in self.schema]
+        for column, value in zip(self.schema, row):
+            if column[1] == INT and not isinstance(value, (int, np.integer)):
+                column[1] = FLOAT
+                changed = True
+        if changed:
+            self.packer = struct.Struct(
+                "<"
+                + "".join("q" if dtype == INT else "d" for _, dtype, _ in self.schema)
+            )
+            self._schema_sent = False
+
+        record = {"metrics": self.packer.pack(*row), "data_dict": data_dict}
+        if not self._schema_sent:
+            record["metrics_schema"] = [list(column) for column in self.schema]
+            self._schema_sent = True
+        return record
+
+
+class MetricsDecoder:
+    """Reconstructs the scalars of each record produced by `MetricsEncoder`, `units` maps names to units."""
+
+    def __init__(self):
+        self.schema: Optional[list] = None
+        self.units: dict = {}
+
+    def decode(self, record: dict) -> dict:
+        """Returns the numeric metrics merged into the record's `data_dict`."""
+        if "metrics_schema" in record:
+            self.schema = record["metrics_schema"]
+            self.units = {name: unit for name, _, unit in self.schema}
+        if "metrics" not in record:
+            return dict(record.get("data_dict", {}))
+        if self.schema is None:
+            raise ValueError(
+                f"Metrics of frame {record.get('frame_num')} received before their schema."
+            )
+        data = record["metrics"]
+        if isinstance(data, str):
+            data = base64.b64decode(data)
+        packer = struct.Struct(
+            "<" + "".join("q" if dtype == INT else "d" for _, dtype, _ in self.schema)
+        )
+        values = dict(zip((name for name, _, _ in self.schema), packer.unpack(data)))
+        return {**record.get("data_dict", {}), **values}
+
+
+class MetricRollups:
+    """
+    Streaming multi-resolution aggregates of the metrics of a run. A level `k`
+    bucket holds the min/mean/max of `2**k` consecutive samples of a metric,
+    for `min_level <= k <= max_level`. Each level keeps one open bucket per
+    metric, a completed bucket is merged into the open bucket of the next
+    level, so memory does not grow with the run and a sample costs O(1)
+    amortized.
+
+    `add` returns the buckets a frame completed as
+    `[name, level, first_frame_num, last_frame_num, min, mean, max]`, on
+    average `2 / 2**min_level` per metric and frame. The open buckets at the
+    end of a run are not returned, the raw samples cover them.
+    """
+
+    def __init__(self, min_level: int = 4, max_level: int = 24):
+        assert 0 <= min_level <= max_level, "Need 0 <= min_level <= max_level"
+        self.min_level = min_level
+        self.max_level = max_level
+        self.open: dict = {}  # name -> per level None or [count, first, last, min, sum, max]
+
+    def add(self, frame_num: int, values: dict) -> list:
+        """`values` maps metric names to numbers, NaN is skipped."""
+        completed = []
+        for name, value in values.items():
+            value = float(value)
+            if math.isnan(value):
+                continue
+            levels = self.open.get(name)
+            if levels is None:
+                levels = self.open[name] = [None] * (
+                    self.max_level - self.min_level + 1
+                )
+            bucket = [1, frame_num, frame_num, value, value, value]
+            for i in range(len(levels)):
+                open_bucket = levels[i]
+                if open_bucket is None:
+                    levels[i] = open_bucket = [
+                        0,
+                        bucket[1],
+                        0,
+                        bucket[3],
+                        0.0,
+                        bucket[5],
+                    ]
+                open_bucket[0] += bucket[0]
+                open_bucket[2] = bucket[2]
+                open_bucket[3] = min(open_bucket[3], bucket[3])
+                open_bucket[4] += bucket[4]
+                open_bucket[5] = max(open_bucket[5], bucket[5])
+                if open_bucket[0] < 1 << (self.min_level + i):
+                    break
+                levels[i] = None
+                count, first, last, low, total, high = open_bucket
+                completed.append(
+                    [name, self.min_level + i, first, last, low, total / count, high]
+                )
+                bucket = open_bucket
+        return completed
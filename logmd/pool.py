@@ -0,0 +1,289 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Optional
+
+import rich
+
+from logmd.constants import LOGMD_PREFIX
+from logmd.queues import BoundedQueue
+from logmd.ring import share_resource_tracker
+from logmd.stats import StatusCollector, UploadStats
+from logmd.upload import TAKEN
+from logmd.worker import upload_worker_process
+
+
+class WorkerPool:
+    """
+    Upload worker processes, started on the first frame and scaled with the load.
+
+    Every `check_interval` seconds `scale` compares the estimated time to drain
+    the upload queue (queue depth * median upload latency / workers) against
+    `target_drain_s`: above it a worker is added, up to `max_workers`. Once the
+    queue stayed empty for `idle_timeout` seconds a worker is retired by
+    sending it the stop signal, down to `min_workers`. A worker that exited
+    without the stop signal (e.g. killed) is replaced and `on_crash` is called
+    with its pid. Scaling decisions are
+    kept in `events` as `(time, "start" | "retire", workers)`.
+    """
+
+    def __init__(
+        self,
+        target,
+        args: tuple,
+        upload_queue,
+        num_workers: int = 3,
+        min_workers: int = 1,
+        max_workers: int = 8,
+        idle_timeout: float = 30.0,
+        target_drain_s: float = 1.0,
+        check_interval: float = 0.5,
+        on_crash=None,
+    ):
+        self.target = target
+        self.args = args
+        self.upload_queue = upload_queue
+        self.num_workers = num_workers
+        self.min_workers = max(1, min(min_workers, num_workers))
+        self.max_workers = max(max_workers, num_workers)
+        self.idle_timeout = idle_timeout
+        self.target_drain_s = target_drain_s
+        self.check_interval = check_interval
+        self.on_crash = on_crash
+
+        self.processes: list = []
+        self.size = 0  # workers that have not been told to stop
+        self.events: list = []
+        self.lock = threading.Lock()
+        self.last_check = 0.0
+        self.last_busy = time.monotonic()
+
+    def _start_worker(self) -> None:
+        process = multiprocessing.Process(target=self.target, args=self.args)
+        process.start()
+        self.processes.append(process)
+        self.size += 1
+        self.events.append((time.time(), "start", self.size))
+
+    def ensure_started(self) -> None:
+        if self.processes:
+            return
+        with self.lock:
+            while self.size < self.num_workers:
+                self._start_worker()
+
+    def _replace_crashed(self) -> None:
+        # workers only exit cleanly after reading a stop signal, which `size` already counts.
+        crashed = [
+            process for process in self.processes if process.exitcode not in (None, 0)
+        ]
+        self.processes = [
+            process for process in self.processes if process.exitcode is None
+        ]
+        for process in crashed:
+            self.size -= 1
+            self._start_worker()
+            if self.on_crash is not None:
+                self.on_crash(process.pid)
+
+    def scale(self, queue_depth: int, latency: float) -> None:
+        """Add or retire a worker, `latency` is the median upload latency in seconds."""
+        now = time.monotonic()
+        if now - self.last_check < self.check_interval:
+            return
+        with self.lock:
+            self.last_check = now
+            self._replace_crashed()
+            if queue_depth > 0:
+                self.last_busy = now
+            drain_s = queue_depth * latency / max(self.size, 1)
+            if drain_s > self.target_drain_s and self.size < self.max_workers:
+                self._start_worker()
+            elif (
+                now - self.last_busy > self.idle_timeout
+                and self.size > self.min_workers
+            ):
+                self.upload_queue.stop()
+                self.size -= 1
+                self.last_busy = now
+                self.events.append((time.time(), "retire", self.size))
+
+    def stop(self) -> list:
+        """Tell the remaining workers to stop, returns the processes to join."""
+        with self.lock:
+            for _ in range(self.size):
+                self.upload_queue.stop()
+            self.size = 0
+            return list(self.processes)
+
+
+class SharedUploadPool:
+    """
+    Upload workers shared by all LogMD runs of a process, so that creating many
+    runs (e.g. a sweep in a notebook) does not create more processes.
+
+    Each run keeps its own `BoundedQueue`, registered under its run_id. A
+    scheduler thread moves frames round-robin, one frame per run per round,
+    from the run queues into the workers' queue, which holds at most
+    `max_outstanding` frames so a run with a large backlog does not delay the
+    frames of the others. Statuses of the workers are routed back to the
+    `UploadStats` of their run. Token, project and compression are carried by
+    each frame, `batch_size` and `linger_ms` apply to all runs.
+
+    Workers report the frames they take (see `report_taken`), the frames a
+    crashed worker held are reported as failed (status 0).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 1,
+        linger_ms: float = 0.0,
+        num_workers: int = 3,
+        min_workers: int = 1,
+        max_workers: int = 8,
+        idle_timeout: float = 30.0,
+    ):
+        self.pid = os.getpid()
+        self.batch_size = batch_size
+        self.linger_ms = linger_ms
+        self.max_outstanding = 4 * max(max_workers, num_workers) * batch_size
+        self.upload_queue = BoundedQueue(
+            self.max_outstanding, 1 << 62, "block", shared=True
+        )
+        self.status_queue = multiprocessing.Queue()
+        self.workers = WorkerPool(
+            upload_worker_process,
+            (self.upload_queue, self.status_queue, batch_size, linger_ms),
+            self.upload_queue,
+            num_workers=num_workers,
+            min_workers=min_workers,
+            max_workers=max_workers,
+            idle_timeout=idle_timeout,
+            on_crash=self.lost,
+        )
+        self.holders: dict = {}  # (run_id, frame_num) -> pid of the worker uploading it
+        self.holders_lock = threading.Lock()
+        self.runs: dict = {}  # run_id -> (upload queue, stats)
+        self.routes: dict = {}  # run_id -> stats, of the runs and the earlier runs they resume
+        self.stats = UploadStats()  # of all runs, drives the scaling
+        self.wakeup = threading.Event()
+        self.closing = threading.Event()
+        self.scheduler = threading.Thread(target=self._schedule, daemon=True)
+        self.scheduler.start()
+        self.status_collector = StatusCollector(self.status_queue, self)
+        self.status_collector.start()
+
+    def register(self, run_id: str, upload_queue, stats: UploadStats) -> None:
+        self.runs[run_id] = (upload_queue, stats)
+        self.routes[run_id] = stats
+
+    def route(self, run_id: str, stats) -> None:
+        """Send the statuses of frames of `run_id` queued by another run to `stats`."""
+        self.routes[run_id] = stats
+
+    def unregister(self, run_id: str) -> None:
+        self.runs.pop(run_id, None)
+        self.routes.pop(run_id, None)
+
+    def notify(self) -> None:
+        """Wake up the scheduler after a frame was queued, starts the workers with the first frame."""
+        if not self.workers.processes:
+            share_resource_tracker()
+            self.workers.ensure_started()
+        self.wakeup.set()
+
+    def record(self, status) -> None:
+        if status[0] == TAKEN:
+            _, pid, keys = status
+            with self.holders_lock:
+                self.holders.update(dict.fromkeys(keys, pid))
+            return
+        with self.holders_lock:
+            self.holders.pop((status[0], status[1]), None)
+        stats = self.routes.get(status[0])
+        if stats is not None:
+            stats.record(status)
+        self.stats.record(status)
+
+    def backlog(self) -> int:
+        return self.upload_queue.qsize() + sum(
+            run[0].qsize() for run in list(self.runs.values())
+        )
+
+    def _schedule(self) -> None:
+        while True:
+            moved = False
+            for run_queue, _ in list(self.runs.values()):
+                try:
+                    item = run_queue.get_nowait()
+                except queue.Empty:
+                    continue
+                # blocks while `max_outstanding` frames wait for the workers.
+                self.upload_queue.put(item, 0)
+                moved = True
+            if self.workers.processes:
+                self.workers.scale(self.backlog(), self.stats.median_latency())
+            if not moved:
+                if self.closing.is_set():
+                    return
+                self.wakeup.wait(timeout=0.1)
+                self.wakeup.clear()
+
+    def lost(self, pid: int) -> None:
+        """Report the frames the crashed worker `pid` held as failed."""
+        with self.holders_lock:
+            keys = [key for key, holder in self.holders.items() if holder == pid]
+        for run_id, frame_num in keys:
+            self.record((run_id, frame_num, 0, 0, 0, 0.0))
+
+    def flush(self, run_id: str, dropped: int = 0, stall_timeout: float = 60.0) -> int:
+        """
+        Wait until all frames of `run_id` were uploaded, `dropped` frames never will.
+        Gives up once no frame completed for `stall_timeout` seconds, returns the
+        number of frames it did not wait for.
+        """
+        run_queue, stats = self.runs[run_id]
+        self.wakeup.set()
+        completed, last_progress = stats.completed, time.monotonic()
+        while run_queue.qsize() or stats.completed + dropped < stats.submitted:
+            if stats.completed != completed:
+                completed, last_progress = stats.completed, time.monotonic()
+            elif time.monotonic() - last_progress > stall_timeout:
+                return stats.submitted - stats.completed - dropped
+            time.sleep(0.01)
+        return 0
+
+    def close(self) -> None:
+        self.closing.set()
+        self.wakeup.set()
+        self.scheduler.join()
+        for process in self.workers.stop():
+            process.join()
+        self.status_collector.stop()
+
+
+_shared_pool: Optional[SharedUploadPool] = None
+
+
+def shared_pool(**settings) -> SharedUploadPool:
+    """
+    The upload pool of this process, created with `settings` by the first
+    LogMD run. A forked child process gets a pool of its own.
+    """
+    global _shared_pool
+    if _shared_pool is None or _shared_pool.pid != os.getpid():
+        _shared_pool = SharedUploadPool(**settings)
+        atexit.register(_shared_pool.close)
+    else:
+        pool = _shared_pool
+        batching = (settings.get("batch_size", 1), settings.get("linger_ms", 0.0))
+        if batching != (pool.batch_size, pool.linger_ms):
+            rich.print(
+                f"{LOGMD_PREFIX}[yellow]Warning: the upload workers of this process batch with "
+                f"batch_size={pool.batch_size} linger_ms={pool.linger_ms}, ignoring "
+                f"batch_size={batching[0]} linger_ms={batching[1]}.[/]"
+            )
+    return _shared_pool
@@ -0,0 +1,156 @@
+import multiprocessing
+import queue
+import threading
+from collections import deque
+
+import numpy as np
+
+POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+
+def record_size(record: dict) -> int:
+    """Approximate memory held by an upload record, its string and bytes fields."""
+    return sum(
+        len(value) for value in record.values() if isinstance(value, (str, bytes))
+    )
+
+
+class BoundedQueue:
+    """
+    Upload queue bounded by number of frames and by bytes.
+
+    When a frame does not fit, `policy` decides what happens:
+        block        wait until the workers caught up (slows the simulation).
+        drop_oldest  drop the oldest pending frames until it fits.
+        drop_newest  drop the new frame.
+        coalesce     drop all pending frames, only the latest one matters for
+                     the live view.
+
+    A frame put with `dependent=True` (e.g. a delta to the frame before it) is
+    useless without its predecessor. With `shared=False`, the dependent frames
+    following a dropped one are dropped too, up to the next independent one,
+    so whole keyframe-to-keyframe groups are dropped.
+
+    A single frame larger than `max_bytes` is always accepted. `shared=True`
+    uses multiprocessing primitives so worker processes can consume the queue,
+    otherwise threading ones. Consumers use `get`/`get_nowait` like a queue,
+    `None` is the stop signal.
+    """
+
+    def __init__(
+        self,
+        max_frames: int,
+        max_bytes: int,
+        policy: str = "block",
+        shared: bool = True,
+    ):
+        assert policy in POLICIES, (
+            f"Unknown backpressure policy `{policy}`, use one of {POLICIES}"
+        )
+        self.max_frames = max_frames
+        self.max_bytes = max_bytes
+        self.policy = policy
+        if shared:
+            self.queue = multiprocessing.Queue()
+            self.size = multiprocessing.Array("q", 2, lock=False)  # frames, bytes
+            self.not_full = multiprocessing.Condition()
+        else:
+            self.queue = queue.Queue()
+            self.size = [0, 0]
+            self.not_full = threading.Condition()
+
+    def full(self, nbytes: int = 0) -> bool:
+        """Whether a frame of `nbytes` would exceed the bounds."""
+        frames, size = self.size[0], self.size[1]
+        return frames > 0 and (
+            frames + 1 > self.max_frames or size + nbytes > self.max_bytes
+        )
+
+    def qsize(self) -> int:
+        return self.size[0]
+
+    def put(self, item, nbytes: int, dependent: bool = False) -> list:
+        """Enqueue `item` according to the policy, returns the items that were dropped."""
+        dropped = []
+        if self.policy == "block":
+            with self.not_full:
+                while self.full(nbytes):
+                    self.not_full.wait(timeout=0.1)
+        elif self.full(nbytes):
+            if self.policy == "drop_newest":
+                return [item]
+            while self.policy == "coalesce" or self.full(nbytes):
+                try:
+                    dropped.append(self.get_nowait())
+                except queue.Empty:
+                    break
+            if dropped:
+                dropped += self._drop_dependents()
+                if dependent and self.qsize() == 0:
+                    # the frame `item` depends on may just have been dropped.
+                    return dropped + [item]
+
+        with self.not_full:
+            self.size[0] += 1
+            self.size[1] += nbytes
+        self.queue.put((nbytes, dependent, item))
+        return dropped
+
+    def _drop_dependents(self) -> list:
+        """Drop the dependent frames at the head of the queue."""
+        if not isinstance(self.queue, queue.Queue):
+            return []  # a multiprocessing queue can not be peeked.
+        dropped = []
+        with self.queue.mutex:
+            entries = self.queue.queue
+            while entries and entries[0] is not None and entries[0][1]:
+                nbytes, _, item = entries.popleft()
+                dropped.append(item)
+                with self.not_full:
+                    self.size[0] -= 1
+                    self.size[1] -= nbytes
+        return dropped
+
+    def stop(self) -> None:
+        """Put the stop signal for one consumer."""
+        self.queue.put(None)
+
+    def get(self, block: bool = True, timeout=None):
+        entry = self.queue.get(block, timeout)
+        if entry is None:
+            return None
+        nbytes, _, item = entry
+        with self.not_full:
+            self.size[0] -= 1
+            self.size[1] -= nbytes
+            self.not_full.notify_all()
+        return item
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+
+class ArrayPool:
+    """
+    Preallocated arrays of one shape that are reused for snapshots, copying into
+    an existing array avoids the page faults of a fresh allocation per frame.
+    """
+
+    def __init__(self):
+        self.shape = None
+        self.free: deque = deque()
+
+    def copy(self, array) -> np.ndarray:
+        if array.shape != self.shape:
+            self.shape = array.shape
+            self.free.clear()
+        try:
+            buffer = self.free.pop()
+        except IndexError:
+            buffer = np.empty_like(array)
+        np.copyto(buffer, array)
+        return buffer
+
+    def release(self, buffer: np.ndarray) -> None:
+        if buffer.shape == self.shape:
+            self.free.append(buffer)
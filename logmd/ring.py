@@ -0,0 +1,149 @@
+"""
+Shared memory transport between `LogMD.__call__` and the upload workers.
+
+The frame payload (pdb string or encoded coordinates) is written into a slot
+of a ring in `multiprocessing.shared_memory`, only a small reference to the
+slot goes through the upload queue. This avoids pickling and piping the
+payload, which is megabytes per frame for large systems.
+
+Segment layout: one flag byte per slot (FREE/FULL/CLOSED) followed by the slots.
+There is a single producer, which scans for the next FREE slot from its
+cursor, writes the payload and then marks the slot FULL. A worker copies the
+payload out and marks the slot FREE again, so no locks are needed. Closing a
+ring marks all slots CLOSED, workers detach from closed rings while they poll
+the upload queue, so the memory of a finished run is freed in every worker.
+
+The pages of a segment are allocated when it is created. An overcommitted
+/dev/shm (e.g. 64 MB in a container) then raises OSError right away instead
+of killing the process with SIGBUS at a later write.
+"""
+
+import os
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+FREE, FULL, CLOSED = 0, 1, 2
+# the upload record fields that hold the payload.
+PAYLOAD_FIELDS = ("frame", "file_contents")
+
+
+def share_resource_tracker() -> None:
+    """
+    Start the resource tracker before the workers are started so they inherit
+    it, otherwise a worker attaching to a ring starts its own tracker, which
+    unlinks the ring when that worker exits.
+    """
+    resource_tracker.ensure_running()
+
+
+# rings created in this process, see `_unmap_inherited`.
+_rings: weakref.WeakSet = weakref.WeakSet()
+
+
+def _unmap_inherited() -> None:
+    # a forked worker would otherwise keep the mapping of every ring that existed
+    # at the fork until it exits, also after the ring was closed and unlinked.
+    for ring in list(_rings):
+        del ring.flags
+        ring.shm.close()
+    _rings.clear()
+
+
+os.register_at_fork(after_in_child=_unmap_inherited)
+
+
+class SharedFrameRing:
+    def __init__(self, num_slots: int, slot_size: int):
+        self.num_slots = num_slots
+        self.slot_size = slot_size
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=num_slots * (1 + slot_size)
+        )
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(self.shm._fd, 0, self.shm.size)
+        except OSError:
+            self.shm.close()
+            self.shm.unlink()
+            raise
+        self.name = self.shm.name
+        self.flags = np.ndarray((num_slots,), dtype=np.uint8, buffer=self.shm.buf)
+        self.flags[:] = FREE
+        self.cursor = 0
+        self.fallbacks = 0  # frames sent through the queue because the ring was full
+        _rings.add(self)
+
+    def put(self, record: dict) -> dict:
+        """
+        Move the payload of `record` into a free slot, returns the record to put
+        on the upload queue. If the payload does not fit or all slots are in
+        use the record is returned unchanged.
+        """
+        field = next(field for field in PAYLOAD_FIELDS if field in record)
+        payload = record[field]
+        data = payload.encode() if isinstance(payload, str) else payload
+        slot = self._free_slot() if len(data) <= self.slot_size else None
+        if slot is None:
+            self.fallbacks += 1
+            return record
+
+        offset = self.num_slots + slot * self.slot_size
+        self.shm.buf[offset : offset + len(data)] = data
+        self.flags[slot] = FULL
+        self.cursor = (slot + 1) % self.num_slots
+
+        record = dict(record)
+        del record[field]
+        record["_slot"] = (
+            self.name,
+            slot,
+            offset,
+            len(data),
+            field,
+            isinstance(payload, str),
+        )
+        return record
+
+    def _free_slot(self):
+        for k in range(self.num_slots):
+            slot = (self.cursor + k) % self.num_slots
+            if self.flags[slot] == FREE:
+                return slot
+        return None
+
+    def release(self, record: dict) -> None:
+        """Free the slot of a record that will not be consumed (e.g. a dropped frame)."""
+        self.flags[record["_slot"][1]] = FREE
+
+    def close(self) -> None:
+        self.flags[:] = CLOSED
+        del self.flags
+        self.shm.close()
+        self.shm.unlink()
+
+
+def take(record: dict, attached: dict) -> dict:
+    """
+    Worker side of `SharedFrameRing.put`: copy the payload back into the record
+    and free its slot. `attached` caches the segments the worker has opened.
+    """
+    if "_slot" not in record:
+        return record
+    name, slot, offset, length, field, is_str = record.pop("_slot")
+    if name not in attached:
+        attached[name] = shared_memory.SharedMemory(name=name)
+    buf = attached[name].buf
+    data = bytes(buf[offset : offset + length])
+    buf[slot] = FREE
+    record[field] = data.decode() if is_str else data
+    return record
+
+
+def detach(attached: dict, closed_only: bool = False) -> None:
+    """Close the attached segments, with `closed_only` those of rings their producer closed."""
+    for name, shm in list(attached.items()):
+        if not closed_only or shm.buf[0] == CLOSED:
+            shm.close()
+            del attached[name]
@@ -0,0 +1,333 @@
+"""
+Durable on-disk spool (write-ahead log) of the frames of a run.
+
+Every frame is appended to `<directory>/<run_id>/frames.wal` before it is
+queued for upload, and its frame_num to `acks` once the backend accepted it.
+Failed uploads are retried with exponential backoff. Delta frames are spooled
+as keyframes, so a retried frame decodes whatever was uploaded before it. A
+circuit breaker stops queueing frames while uploads fail or are slow, frames
+are then only spooled and replayed once a probe upload succeeds. Frames a previous process did not
+get acknowledged are resumed by the next `Spool` on the same directory.
+
+Entry layout: little-endian uint32 length, then a JSON object
+`{"project": ..., "record": ..., "bytes": [...]}`, the record fields listed in
+"bytes" (e.g. encoded frames) are base64 encoded. JSON rather than pickle, as
+`logmd sync` reads spools copied from elsewhere.
+"""
+
+import base64
+import fcntl
+import heapq
+import json
+import os
+import random
+import struct
+import threading
+import time
+from typing import Optional
+
+from logmd.codec import KeyframeRewriter
+
+ENTRY_HEADER = struct.Struct("<I")
+WAL, ACKS, SYNCED = "frames.wal", "acks", "synced"
+
+
+def _dump_entry(project: str, record: dict) -> bytes:
+    binary = [key for key, value in record.items() if isinstance(value, bytes)]
+    record = {
+        key: base64.b64encode(value).decode("ascii") if key in binary else value
+        for key, value in record.items()
+    }
+    return json.dumps(
+        {"project": project, "record": record, "bytes": binary}, separators=(",", ":")
+    ).encode()
+
+
+def _load_entry(data: bytes):
+    entry = json.loads(data)
+    record = entry["record"]
+    for key in entry["bytes"]:
+        record[key] = base64.b64decode(record[key])
+    return entry["project"], record
+
+
+class RunLog:
+    """Frame log and acks of one run, locked by the process using it."""
+
+    def __init__(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.wal = open(os.path.join(path, WAL), "ab+")
+        try:
+            # raises BlockingIOError while another process uses the run.
+            fcntl.flock(self.wal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            self.wal.close()
+            raise
+        self.acks = open(os.path.join(path, ACKS), "a")
+        self.end = self.wal.seek(0, os.SEEK_END)
+        self.dirty = False
+
+    def append(self, project: str, record: dict) -> int:
+        """Returns the offset of the entry."""
+        data = _dump_entry(project, record)
+        offset = self.end
+        self.wal.write(ENTRY_HEADER.pack(len(data)))
+        self.wal.write(data)
+        self.wal.flush()
+        self.end += ENTRY_HEADER.size + len(data)
+        self.dirty = True
+        return offset
+
+    def read(self, offset: int):
+        """Returns the `(project, record)` at `offset`."""
+        fd = self.wal.fileno()
+        (length,) = ENTRY_HEADER.unpack(os.pread(fd, ENTRY_HEADER.size, offset))
+        return _load_entry(os.pread(fd, length, offset + ENTRY_HEADER.size))
+
+    def entries(self):
+        """Yields (offset, frame_num) of all complete entries, a torn last entry is skipped."""
+        offset = 0
+        while offset + ENTRY_HEADER.size <= self.end:
+            (length,) = ENTRY_HEADER.unpack(
+                os.pread(self.wal.fileno(), ENTRY_HEADER.size, offset)
+            )
+            if offset + ENTRY_HEADER.size + length > self.end:
+                return
+            yield offset, self.read(offset)[1]["frame_num"]
+            offset += ENTRY_HEADER.size + length
+
+    def acked(self) -> set:
+        with open(os.path.join(self.path, ACKS)) as f:
+            return {line.strip() for line in f}
+
+    def ack(self, frame_num: str) -> None:
+        self.acks.write(f"{frame_num}\n")
+        self.acks.flush()
+
+    def sync(self) -> None:
+        if self.dirty:
+            self.dirty = False
+            os.fsync(self.wal.fileno())
+
+    def close(self, remove: bool = False) -> None:
+        """Closes the log, `remove` deletes it (other files of the run directory stay)."""
+        self.sync()
+        self.acks.close()
+        self.wal.close()
+        if remove:
+            for name in (WAL, ACKS):
+                os.remove(os.path.join(self.path, name))
+            if not os.listdir(self.path):
+                os.rmdir(self.path)
+
+
+class Spool:
+    """
+    Spool of the run `run_id` in `directory`, plus the unacknowledged frames of
+    earlier runs in it. `enqueue(record, project)` queues a retried frame,
+    statuses are passed to `record` (which forwards them to `stats`).
+
+    Fully acknowledged logs are deleted on `close`, with `keep=True` they stay
+    (e.g. offline recordings) and are marked as synced instead.
+
+    The circuit breaker opens after `max_failures` failed or slower than
+    `slow_s` uploads in a row. While open, new frames are only spooled. After
+    `cooldown_s` (doubling up to `max_cooldown_s` while failures continue) one
+    frame is sent as probe, if it succeeds the breaker closes and the spooled
+    frames are replayed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        run_id: Optional[str],
+        enqueue,
+        stats,
+        keep: bool = False,
+        max_failures: int = 5,
+        slow_s: float = 10.0,
+        backoff_s: float = 0.5,
+        max_backoff_s: float = 60.0,
+        cooldown_s: float = 5.0,
+        max_cooldown_s: float = 120.0,
+        fsync_interval: float = 1.0,
+    ):
+        self.directory = directory
+        self.run_id = run_id
+        self.enqueue = enqueue
+        self.stats = stats
+        self.keep = keep
+        self.max_failures = max_failures
+        self.slow_s = slow_s
+        self.backoff_s = backoff_s
+        self.max_backoff_s = max_backoff_s
+        self.min_cooldown_s = cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self.fsync_interval = fsync_interval
+
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.logs = (
+            {} if run_id is None else {run_id: RunLog(os.path.join(directory, run_id))}
+        )
+        self.keyframes = KeyframeRewriter()
+        self.pending: dict = {}  # (run_id, frame_num) -> offset, frames not acknowledged
+        self.attempts: dict = {}  # (run_id, frame_num) -> failed uploads
+        self.retries: list = []  # heap of (due, (run_id, frame_num))
+        self.parked: set = set()  # frames waiting for the breaker to close
+        self.state = "closed"  # "closed" | "open" | "half_open"
+        self.failures = 0
+        self.cooldown_s = cooldown_s
+        self.open_until = 0.0
+
+        self.resumed = self._resume()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _resume(self) -> int:
+        """Schedules the frames earlier runs left unacknowledged, returns their number."""
+        count = 0
+        for run_id in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, run_id)
+            if (
+                run_id in self.logs
+                or not os.path.exists(os.path.join(path, WAL))
+                or os.path.exists(os.path.join(path, SYNCED))
+            ):
+                continue
+            try:
+                log = RunLog(path)
+            except BlockingIOError:
+                continue
+            acked = log.acked()
+            pending = [
+                (offset, frame_num)
+                for offset, frame_num in log.entries()
+                if frame_num not in acked
+            ]
+            if not pending:
+                self._close_synced(log)
+                continue
+            self.logs[run_id] = log
+            for offset, frame_num in pending:
+                self.pending[(run_id, frame_num)] = offset
+                heapq.heappush(self.retries, (0.0, (run_id, frame_num)))
+            count += len(pending)
+        return count
+
+    def append(self, record: dict, project: str) -> bool:
+        """Spools a new frame of the run, returns whether to queue it now."""
+        offset = self.logs[self.run_id].append(project, self.keyframes.rewrite(record))
+        key = (self.run_id, record["frame_num"])
+        with self.lock:
+            self.pending[key] = offset
+            if self.state != "closed":
+                self.parked.add(key)
+                return False
+        return True
+
+    def defer(self, record: dict) -> None:
+        """Retry a queued frame later, e.g. one dropped by the backpressure policy."""
+        with self.lock:
+            self._schedule((record["run_id"], record["frame_num"]), time.monotonic())
+
+    def _schedule(self, key, now: float) -> None:
+        if key not in self.pending:
+            return
+        if self.state != "closed":
+            self.parked.add(key)
+            return
+        attempts = self.attempts.get(key, 0)
+        delay = min(self.backoff_s * 2**attempts, self.max_backoff_s) * random.uniform(
+            0.5, 1.0
+        )
+        heapq.heappush(self.retries, (now + delay, key))
+
+    def record(self, status) -> None:
+        run_id, frame_num, status_code, _, _, latency = status
+        self.stats.record(status)
+        key = (run_id, frame_num)
+        ok = 200 <= status_code < 300
+        now = time.monotonic()
+        with self.lock:
+            if ok:
+                self.attempts.pop(key, None)
+                if self.pending.pop(key, None) is not None:
+                    self.logs[run_id].ack(frame_num)
+            else:
+                self.attempts[key] = self.attempts.get(key, 0) + 1
+            self._breaker(ok and latency < self.slow_s, now)
+            if not ok:
+                self._schedule(key, now)
+
+    def _breaker(self, healthy: bool, now: float) -> None:
+        if healthy:
+            self.failures = 0
+            if self.state == "half_open":
+                self.state = "closed"
+                self.cooldown_s = self.min_cooldown_s
+                for key in self.parked:
+                    heapq.heappush(self.retries, (now, key))
+                self.parked.clear()
+            return
+        self.failures += 1
+        if self.state == "half_open" or (
+            self.state == "closed" and self.failures >= self.max_failures
+        ):
+            self.state = "open"
+            self.open_until = now + self.cooldown_s
+            self.cooldown_s = min(2 * self.cooldown_s, self.max_cooldown_s)
+            while self.retries:
+                self.parked.add(heapq.heappop(self.retries)[1])
+
+    def retrying(self) -> bool:
+        """Whether frames wait for a retry or for the breaker to close."""
+        with self.lock:
+            return bool(self.retries) or bool(self.parked)
+
+    def _due(self, now: float) -> list:
+        due = []
+        with self.lock:
+            if self.state != "closed" and now >= self.open_until and self.parked:
+                # probe, if its status does not arrive in time probe again.
+                self.state = "half_open"
+                self.open_until = now + max(self.slow_s, self.cooldown_s)
+                due.append(min(self.parked, key=lambda key: self.pending.get(key, 0)))
+                self.parked.discard(due[0])
+            while self.state == "closed" and self.retries and self.retries[0][0] <= now:
+                key = heapq.heappop(self.retries)[1]
+                if key in self.pending:
+                    due.append(key)
+            return [(key, self.pending[key]) for key in due if key in self.pending]
+
+    def _run(self) -> None:
+        last_sync = time.monotonic()
+        while not self.stopping.wait(0.05):
+            now = time.monotonic()
+            for (run_id, _), offset in self._due(now):
+                project, record = self.logs[run_id].read(offset)
+                self.enqueue(record, project)
+            if now - last_sync >= self.fsync_interval:
+                last_sync = now
+                for log in list(self.logs.values()):
+                    log.sync()
+
+    def close(self) -> int:
+        """Stops retrying, returns the number of frames left for the next spool on the directory."""
+        self.stopping.set()
+        self.thread.join()
+        with self.lock:
+            left = {key[0] for key in self.pending}
+            for run_id, log in self.logs.items():
+                if run_id in left:
+                    log.close()
+                else:
+                    self._close_synced(log)
+            return len(self.pending)
+
+    def _close_synced(self, log: RunLog) -> None:
+        log.close(remove=not self.keep)
+        if self.keep:
+            open(os.path.join(log.path, SYNCED), "w").close()
@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from logmd.constants import LOGMD_PREFIX
+
+
+class UploadStats:
+    """Running upload telemetry fed by the `(run_id, frame_num, status_code, raw_bytes, sent_bytes, latency)` statuses."""
+
+    def __init__(self, window: int = 1024):
+        self.lock = threading.Lock()
+        self.start = time.monotonic()
+        self.submitted = 0
+        self.completed = 0
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+        self.errors: Counter = (
+            Counter()
+        )  # status code -> count, 0 is a connection error
+        self.latencies: deque = deque(
+            maxlen=window
+        )  # seconds, of the last `window` frames
+
+    def submit(self) -> None:
+        with self.lock:
+            self.submitted += 1
+
+    def record(self, status) -> None:
+        _, _, status_code, raw_bytes, sent_bytes, latency = status
+        with self.lock:
+            self.completed += 1
+            self.raw_bytes += raw_bytes
+            self.sent_bytes += sent_bytes
+            self.latencies.append(latency)
+            if not 200 <= status_code < 300:
+                self.errors[status_code] += 1
+
+    def median_latency(self) -> float:
+        with self.lock:
+            return float(np.median(self.latencies)) if self.latencies else 0.0
+
+    def summary(self, queue_depth: int = 0, dropped: int = 0) -> dict:
+        with self.lock:
+            elapsed = max(time.monotonic() - self.start, 1e-9)
+            latencies = np.array(self.latencies) if self.latencies else np.zeros(1)
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            return {
+                "frames": self.completed,
+                "frames_per_s": self.completed / elapsed,
+                "bytes_per_s": self.sent_bytes / elapsed,
+                "raw_bytes": self.raw_bytes,
+                "sent_bytes": self.sent_bytes,
+                "queue_depth": queue_depth,
+                "in_flight": max(
+                    self.submitted - self.completed - queue_depth - dropped, 0
+                ),
+                "dropped": dropped,
+                "latency_p50": float(p50),
+                "latency_p95": float(p95),
+                "latency_p99": float(p99),
+                "errors": sum(self.errors.values()),
+                "errors_by_status": dict(self.errors),
+            }
+
+
+def status_line(stats: dict) -> str:
+    """Compact rich markup line of a `UploadStats.summary`."""
+    errors = f"[red]{stats['errors']}[/]" if stats["errors"] else "0"
+    return (
+        f"{LOGMD_PREFIX}[blue]{stats['frames_per_s']:.1f}[/] frames/s "
+        f"[blue]{stats['bytes_per_s'] / 1e6:.2f}[/] MB/s "
+        f"queue=[blue]{stats['queue_depth']}[/] in_flight=[blue]{stats['in_flight']}[/] "
+        f"p50/p95/p99=[blue]{stats['latency_p50'] * 1e3:.0f}/{stats['latency_p95'] * 1e3:.0f}/{stats['latency_p99'] * 1e3:.0f}ms[/] "
+        f"errors={errors}"
+    )
+
+
+class StatusCollector(threading.Thread):
+    """Reads the statuses the upload workers put on `status_queue` into `stats` (anything with `record(status)`)."""
+
+    def __init__(self, status_queue, stats: UploadStats):
+        super().__init__(daemon=True)
+        self.status_queue = status_queue
+        self.stats = stats
+        self.stopping = threading.Event()
+
+    def run(self) -> None:
+        while True:
+            try:
+                self.stats.record(self.status_queue.get(timeout=0.1))
+            except queue.Empty:
+                if self.stopping.is_set():
+                    return
+
+    def stop(self) -> None:
+        """Stop once the queue is drained, call after the workers exited."""
+        self.stopping.set()
+        self.join()
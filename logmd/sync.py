@@ -0,0 +1,93 @@
+"""
+`logmd sync`: bulk upload of runs recorded with `LogMD(offline=True)`, or left
+unacknowledged in an upload spool.
+"""
+
+import threading
+import time
+
+import rich
+from tqdm import tqdm
+
+from logmd.auth import load_token
+from logmd.constants import LOGMD_PREFIX
+from logmd.pool import shared_pool
+from logmd.queues import BoundedQueue, record_size
+from logmd.spool import Spool
+from logmd.stats import UploadStats
+
+
+def sync(
+    directory: str,
+    num_workers: int = 8,
+    batch_size: int = 16,
+    compress: bool = True,
+    stall_timeout: float = 60.0,
+) -> dict:
+    """
+    Uploads the frames of the runs in `directory` that were not uploaded yet,
+    returns the upload stats. Frames are acknowledged in the spool of their run
+    as they are uploaded, an interrupted sync continues where it stopped and
+    runs that were synced completely are skipped. Gives up once no frame was
+    uploaded for `stall_timeout` seconds.
+    """
+    token = None
+    ready = threading.Event()  # the token is loaded once the projects are known
+    pool = shared_pool(
+        batch_size=batch_size, num_workers=num_workers, max_workers=num_workers
+    )
+    upload_queue = BoundedQueue(
+        4 * num_workers * batch_size, 1 << 30, "block", shared=False
+    )
+    stats = UploadStats()
+
+    def enqueue(record: dict, project: str) -> None:
+        ready.wait()
+        # public runs (no project) are uploaded without login, as by LogMD.
+        record["_request"] = (token if project else None, project, compress)
+        stats.submit()
+        upload_queue.put(record, record_size(record))
+        pool.notify()
+
+    pool.register(directory, upload_queue, stats)
+    spool = Spool(directory, None, enqueue, stats, keep=True)
+    for run_id in spool.logs:
+        pool.route(run_id, spool)
+    offsets = {run_id: offset for (run_id, _), offset in spool.pending.items()}
+    if any(spool.logs[run_id].read(offset)[0] for run_id, offset in offsets.items()):
+        token = load_token()
+    ready.set()
+    rich.print(
+        f"{LOGMD_PREFIX}Syncing=[blue]{spool.resumed}[/] frames of [blue]{len(spool.logs)}[/] runs from `{directory}`"
+    )
+
+    t0 = last_progress = time.monotonic()
+    with tqdm(total=spool.resumed, unit="frame", desc="Syncing") as bar:
+        while spool.pending and time.monotonic() - last_progress < stall_timeout:
+            time.sleep(0.5)
+            done = spool.resumed - len(spool.pending)
+            if done > bar.n:
+                last_progress = time.monotonic()
+                bar.update(done - bar.n)
+                bar.set_postfix_str(
+                    f"{stats.sent_bytes / 1e6 / (time.monotonic() - t0):.2f} MB/s"
+                )
+
+    pool.flush(directory)
+    left = spool.close()
+    pool.unregister(directory)
+    for run_id in spool.logs:
+        pool.unregister(run_id)
+
+    summary = stats.summary()
+    seconds = time.monotonic() - t0
+    rich.print(
+        f"{LOGMD_PREFIX}Synced=[blue]{spool.resumed - left}[/] frames in [blue]{seconds:.1f}s[/] "
+        f"([blue]{(spool.resumed - left) / max(seconds, 1e-9):.1f}[/] frames/s, "
+        f"[blue]{summary['sent_bytes'] / 1e6 / max(seconds, 1e-9):.2f}[/] MB/s)"
+    )
+    if left:
+        rich.print(
+            f"{LOGMD_PREFIX}[yellow]Not synced=[blue]{left}[/] frames, run `logmd sync {directory}` again[/]"
+        )
+    return summary
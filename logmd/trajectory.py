@@ -0,0 +1,194 @@
+"""
+Append-only trajectory container of the frames `store_locally` keeps,
+`logmd/<run_id>/trajectory.lmdt`, one file per run instead of one per frame.
+
+Layout (little-endian):
+    header  b"LMDT", uint32 version
+    frames  per frame: uint32 length, uint64 frame_num, `length` bytes pdb text
+    index   per frame: uint64 frame_num, uint64 offset of the frame
+    footer  uint64 offset of the index, uint64 number of frames, b"LMDI"
+
+The index is written by `TrajectoryWriter.close`. A file without index (the
+writing process died) is still readable, the frames are scanned instead, and
+reopening it for writing appends after the last complete frame.
+"""
+
+import os
+import struct
+import time
+
+import numpy as np
+
+MAGIC, INDEX_MAGIC = b"LMDT", b"LMDI"
+VERSION = 1
+HEADER = struct.Struct("<4sI")
+FRAME_HEADER = struct.Struct("<IQ")
+FOOTER = struct.Struct("<QQ4s")
+INDEX_DTYPE = np.dtype([("frame_num", "<u8"), ("offset", "<u8")])
+
+
+def _read_index(f, size: int):
+    """Returns (index, end of the frames) from the footer, or by scanning the frames."""
+    if size >= HEADER.size + FOOTER.size:
+        f.seek(size - FOOTER.size)
+        index_offset, count, magic = FOOTER.unpack(f.read(FOOTER.size))
+        if (
+            magic == INDEX_MAGIC
+            and index_offset + count * INDEX_DTYPE.itemsize + FOOTER.size == size
+        ):
+            f.seek(index_offset)
+            index = np.frombuffer(
+                f.read(count * INDEX_DTYPE.itemsize), dtype=INDEX_DTYPE
+            )
+            return [tuple(map(int, entry)) for entry in index], index_offset
+
+    index, offset = [], HEADER.size
+    while offset + FRAME_HEADER.size <= size:
+        f.seek(offset)
+        length, frame_num = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))
+        if offset + FRAME_HEADER.size + length > size:
+            break
+        index.append((frame_num, offset))
+        offset += FRAME_HEADER.size + length
+    return index, offset
+
+
+class FreeSpace:
+    """
+    Whether a directory has at least `min_free_bytes` free. statvfs runs every
+    `check_bytes` written bytes, and every `check_interval` seconds while the
+    space is low, instead of once per frame.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        min_free_bytes: int = 1_000_000_000,
+        check_bytes: int = 64 << 20,
+        check_interval: float = 10.0,
+    ):
+        self.path = path
+        self.min_free_bytes = min_free_bytes
+        self.check_bytes = check_bytes
+        self.check_interval = check_interval
+        self.last_check = 0.0
+        self.unchecked_bytes = check_bytes  # check before the first frame
+        self.low = False
+
+    def __call__(self) -> bool:
+        now = time.monotonic()
+        due = self.unchecked_bytes >= self.check_bytes or (
+            self.low and now - self.last_check >= self.check_interval
+        )
+        if due:
+            stat = os.statvfs(self.path)
+            self.low = stat.f_frsize * stat.f_bavail < self.min_free_bytes
+            self.last_check = now
+            self.unchecked_bytes = 0
+        return not self.low
+
+    def written(self, nbytes: int) -> None:
+        self.unchecked_bytes += nbytes
+
+
+class TrajectoryWriter:
+    """
+    Buffered writer of a trajectory container. The file is fsynced at most every
+    `fsync_interval` seconds, frames are skipped while less than
+    `min_free_bytes` are free (see `FreeSpace`).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        buffer_size: int = 1 << 20,
+        fsync_interval: float = 10.0,
+        min_free_bytes: int = 1_000_000_000,
+        check_bytes: int = 64 << 20,
+        check_interval: float = 10.0,
+    ):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.has_space = FreeSpace(
+            os.path.dirname(path) or ".", min_free_bytes, check_bytes, check_interval
+        )
+
+        if os.path.exists(path):
+            self.file = open(path, "r+b", buffering=buffer_size)
+            self.index, self.end = _read_index(self.file, os.path.getsize(path))
+            self.file.truncate(self.end)
+            self.file.seek(self.end)
+        else:
+            self.file = open(path, "wb", buffering=buffer_size)
+            self.file.write(HEADER.pack(MAGIC, VERSION))
+            self.index, self.end = [], HEADER.size
+        self.last_sync = time.monotonic()
+
+    def append(self, frame_num: int, text: str) -> bool:
+        """Appends a frame, returns False if it was skipped because the disk is almost full."""
+        if not self.has_space():
+            return False
+        data = text.encode()
+        self.file.write(FRAME_HEADER.pack(len(data), frame_num))
+        self.file.write(data)
+        self.index.append((frame_num, self.end))
+        self.end += FRAME_HEADER.size + len(data)
+        self.has_space.written(FRAME_HEADER.size + len(data))
+
+        if time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.sync()
+        return True
+
+    def sync(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Writes the index and closes the file."""
+        index = np.array(self.index, dtype=INDEX_DTYPE)
+        self.file.write(index.tobytes())
+        self.file.write(FOOTER.pack(self.end, len(index), INDEX_MAGIC))
+        self.sync()
+        self.file.close()
+
+
+class TrajectoryReader:
+    """Random access to the frames of a trajectory container, `reader[i]` is the pdb text of the i-th frame."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            magic, version = HEADER.unpack(f.read(HEADER.size))
+            assert magic == MAGIC, f"`{path}` is not a logmd trajectory"
+            assert version == VERSION, f"Unsupported trajectory version {version}"
+            self.index, _ = _read_index(f, os.path.getsize(path))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def frame_nums(self) -> list:
+        return [frame_num for frame_num, _ in self.index]
+
+    def __getitem__(self, i: int) -> str:
+        _, offset = self.index[i]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            length, _ = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))
+            return f.read(length).decode()
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            for _, offset in self.index:
+                f.seek(offset)
+                length, _ = FRAME_HEADER.unpack(f.read(FRAME_HEADER.size))
+                yield f.read(length).decode()
+
+    def export_pdb(self, directory: str) -> int:
+        """Writes the frames as `<directory>/<frame_num>.pdb`, the former `store_locally` layout."""
+        os.makedirs(directory, exist_ok=True)
+        for frame_num, text in zip(self.frame_nums, self):
+            with open(os.path.join(directory, f"{frame_num}.pdb"), "w") as f:
+                f.write(text)
+        return len(self)
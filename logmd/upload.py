@@ -0,0 +1,305 @@
+"""
+Helpers shared by the upload workers: batching frames and building requests,
+and the asyncio upload engine.
+"""
+
+import asyncio
+import base64
+import concurrent.futures
+import json
+import os
+import queue
+import threading
+import time
+
+import httpx
+
+from logmd.compression import AdaptiveCompressor
+from logmd.utils import get_upload_url, queue_depth
+
+# under backlog a batch grows up to `batch_size * MAX_BATCH_GROWTH` frames.
+MAX_BATCH_GROWTH = 16
+# status code of frames whose request could not be built, e.g. a value JSON can not serialize.
+INVALID_REQUEST = -1
+# first field of the message a worker sends before uploading frames, see `report_taken`.
+TAKEN = "_taken"
+
+
+def request_body(records: list, token, project: str) -> bytes:
+    """
+    JSON body for uploading `records`. A single frame is posted in the
+    original one-frame-per-request layout, several frames as a `frames` list.
+    """
+    data = {
+        "user_id": "public" if token is None else token.email,
+        "token": None if token is None else token.token,
+        "project": project,
+    }
+    records = [_jsonable(record) for record in records]
+    if len(records) == 1:
+        data.update(records[0])
+    else:
+        data["frames"] = records
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+def group_by_request(records: list) -> list:
+    """
+    Splits records by the request settings of their run, `_request` (token, project,
+    compress), into [((token, project, compress), records)].
+    """
+    groups: list = []
+    for record in records:
+        settings = record.pop("_request")
+        for group_settings, group in groups:
+            if group_settings == settings:
+                group.append(record)
+                break
+        else:
+            groups.append((settings, [record]))
+    return groups
+
+
+def _jsonable(record: dict) -> dict:
+    # binary payloads (e.g. encoded frames) are base64 encoded here, off the simulation thread.
+    return {
+        key: base64.b64encode(value).decode("ascii")
+        if isinstance(value, bytes)
+        else value
+        for key, value in record.items()
+    }
+
+
+def request_content(body: bytes, compressor=None, backlog: int = 0):
+    """Returns (content, headers) of a request, compressed if a compressor is given."""
+    headers = {"Content-Type": "application/json"}
+    content, encoding = body, None
+    if compressor is not None:
+        content, encoding = compressor.compress(body, backlog=backlog)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return content, headers
+
+
+def report_status(
+    status_queue,
+    batch: list,
+    status_code: int,
+    raw_bytes: int,
+    sent_bytes: int,
+    latency: float,
+) -> None:
+    """Report per frame of `batch`, the bytes of a batch are split evenly."""
+    for item in batch:
+        status_queue.put(
+            (
+                item.get("run_id"),
+                item["frame_num"],
+                status_code,
+                raw_bytes // len(batch),
+                sent_bytes // len(batch),
+                latency,
+            )
+        )
+
+
+def report_invalid(status_queue, records: list, error: Exception) -> None:
+    """Report the frames of a request that could not be built as failed."""
+    import rich
+
+    from logmd.constants import LOGMD_PREFIX
+
+    rich.print(
+        f"{LOGMD_PREFIX}[red]Error while building the upload of {len(records)} frames: `[dim]{error}[/]`[/]"
+    )
+    report_status(status_queue, records, INVALID_REQUEST, 0, 0, 0.0)
+
+
+def report_taken(status_queue, batch: list) -> None:
+    """Tell the pool which frames this worker holds, it reports them as failed if the worker dies."""
+    status_queue.put(
+        (
+            TAKEN,
+            os.getpid(),
+            [(item.get("run_id"), item.get("frame_num")) for item in batch],
+        )
+    )
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class Batcher:
+    """
+    Collects frames from a queue into batches: up to `size` frames, waiting at
+    most `linger_ms` for the batch to fill. `size` starts at `batch_size`,
+    doubles while the backlog exceeds it and shrinks back once it is drained.
+    """
+
+    def __init__(self, batch_size: int = 1, linger_ms: float = 0.0):
+        assert batch_size >= 1, "batch_size must be positive"
+        self.min_size = batch_size
+        self.max_size = batch_size if batch_size == 1 else batch_size * MAX_BATCH_GROWTH
+        self.size = batch_size
+        self.linger = linger_ms / 1000
+
+    def next_batch(self, upload_queue, timeout=None):
+        """
+        Returns (frames, done), `done` is set once the stop signal `None` was read.
+        Without a frame within `timeout` seconds the batch is empty.
+        """
+        try:
+            item = upload_queue.get(timeout=timeout)
+        except queue.Empty:
+            return [], False
+        if item is None:
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    item = upload_queue.get(timeout=remaining)
+                else:
+                    item = upload_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def adapt(self, backlog: int) -> None:
+        if backlog > self.size:
+            self.size = min(2 * self.size, self.max_size)
+        elif backlog == 0:
+            self.size = max(self.size // 2, self.min_size)
+
+
+class DaemonExecutor(concurrent.futures.ThreadPoolExecutor):
+    """
+    Runs each call in a new daemon thread. Unlike the threads of a plain
+    `ThreadPoolExecutor` they start while the interpreter exits and are not joined at exit.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        def run():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+
+class AsyncUploader(threading.Thread):
+    """
+    Upload engine running an asyncio loop with `httpx.AsyncClient` in one
+    background thread. Keeps up to `concurrency` requests in flight over a few
+    (HTTP/2 multiplexed, if `h2` is installed) connections instead of one
+    blocking request per worker process.
+
+    Consumes `upload_queue` like the worker processes do, frames carrying their
+    `_request` settings, and stops on `None`. A daemon thread reads the queue
+    so that exiting without `LogMD.cleanup` does not hang.
+    """
+
+    def __init__(
+        self,
+        upload_queue,
+        status_queue,
+        batch_size: int = 1,
+        linger_ms: float = 0.0,
+        concurrency: int = 32,
+    ):
+        super().__init__(daemon=True)
+        self.upload_queue = upload_queue
+        self.status_queue = status_queue
+        self.compressor = AdaptiveCompressor()
+        self.batcher = Batcher(batch_size, linger_ms)
+        self.concurrency = concurrency
+        self.in_flight = threading.Semaphore(
+            concurrency
+        )  # frames stay in `upload_queue` beyond it
+
+    def run(self) -> None:
+        asyncio.run(self._main())
+
+    def _read(self, loop, batches) -> None:
+        # blocking reads happen in this daemon thread rather than the loop's executor,
+        # whose threads the interpreter joins at exit before `LogMD.cleanup` stops them.
+        done = False
+        while not done:
+            self.in_flight.acquire()
+            batch, done = self.batcher.next_batch(self.upload_queue)
+            if not batch:
+                self.in_flight.release()
+            loop.call_soon_threadsafe(batches.put_nowait, (batch, done))
+
+    async def _main(self) -> None:
+        loop = asyncio.get_running_loop()
+        # e.g. DNS lookups, also while the interpreter exits.
+        loop.set_default_executor(DaemonExecutor())
+        http2 = http2_available()
+        limits = httpx.Limits(max_connections=4 if http2 else self.concurrency)
+        batches: asyncio.Queue = asyncio.Queue()
+        tasks: set = set()
+        threading.Thread(target=self._read, args=(loop, batches), daemon=True).start()
+
+        async with httpx.AsyncClient(timeout=180, http2=http2, limits=limits) as client:
+            done = False
+            while not done:
+                batch, done = await batches.get()
+                if not batch:
+                    continue
+                task = asyncio.create_task(self._upload_batch(client, batch))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+
+    async def _upload_batch(self, client, batch: list) -> None:
+        try:
+            backlog = queue_depth(self.upload_queue)
+            self.batcher.adapt(backlog)
+            # e.g. resumed frames of earlier runs with another project.
+            for settings, records in group_by_request(batch):
+                await self._upload(client, records, *settings, backlog)
+        finally:
+            self.in_flight.release()
+
+    async def _upload(
+        self, client, records: list, token, project: str, compress: bool, backlog: int
+    ) -> None:
+        try:
+            body = request_body(records, token, project)
+            content, headers = request_content(
+                body, self.compressor if compress else None, backlog
+            )
+        except Exception as e:
+            report_invalid(self.status_queue, records, e)
+            return
+        t0 = time.perf_counter()
+        try:
+            response = await client.post(
+                get_upload_url(), content=content, headers=headers
+            )
+            status_code = response.status_code
+        except httpx.HTTPError:
+            status_code = 0
+        latency = time.perf_counter() - t0
+        if compress:
+            self.compressor.observe_upload(len(content), latency)
+        report_status(
+            self.status_queue, records, status_code, len(body), len(content), latency
+        )
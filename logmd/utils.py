@@ -1,7 +1,8 @@
 import os
 import random
 
-from logmd.constants import ADJECTIVES, NOUNS
+import numpy as np
+
 
 FE_DEV = "http://localhost:5173"
 FE_PROD = "https://rcsb.ai"
@@ -21,6 +22,14 @@ def get_upload_url():
     return BE_PROD if not is_dev() else BE_DEV
 
 
+def queue_depth(queue) -> int:
+    """Approximate size of a multiprocessing queue (0 where qsize is unsupported, e.g. macOS)."""
+    try:
+        return queue.qsize()
+    except NotImplementedError:
+        return 0
+
+
 def get_run_id(num: int) -> str:
     """
     Get a run id for the given number.
@@ -31,6 +40,8 @@ def get_run_id(num: int) -> str:
     Returns:
         A run id in the format of "<adjective>-<noun>-<number>".
     """
+    from logmd.words import ADJECTIVES, NOUNS
+
     adj, noun = (
         random.sample(ADJECTIVES, 1)[0],
         random.sample(NOUNS, 1)[0],
@@ -64,6 +75,180 @@ def update_pdb_positions(pdb_string, new_positions):
     return "\n".join(updated_lines)
 
 
+# characters written for a coordinate field, i.e. f"{x:8.3f}".
+COORD_WIDTH = 8
+_DIGITS = np.frombuffer(b"0123456789", dtype=np.uint8)
+_SPACE, _MINUS, _DOT = ord(" "), ord("-"), ord(".")
+
+
+def quantize_positions(positions) -> np.ndarray:
+    """
+    Round positions to integer milli-Angstrom exactly like f"{x:.3f}" does.
+
+    `np.rint(x * 1000)` disagrees with Python's correctly rounded formatting
+    when `x` sits (within float error) on a 0.0005 boundary, those few
+    entries are re-rounded with `format`.
+
+    :param positions: array of positions in Angstrom.
+    :return: int64 array of the same shape in units of 0.001 Angstrom.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    scaled = positions * 1000
+    quantized = np.rint(scaled)
+    ties = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    for index in zip(*np.nonzero(ties)):
+        quantized[index] = int(format(positions[index], ".3f").replace(".", ""))
+    return quantized.astype(np.int64)
+
+
+def format_coordinates(quantized, negative=None):
+    """
+    Vectorized fixed-width `%8.3f` formatter.
+
+    :param quantized: int array of coordinates in units of 0.001 Angstrom.
+    :param negative: optional bool array, sign per entry (keeps `-0.000`).
+    :return: uint8 array with a trailing axis of 8 ascii characters, or None
+        if any value does not fit in 8 characters.
+    """
+    quantized = np.asarray(quantized, dtype=np.int64)
+    if negative is None:
+        negative = quantized < 0
+    magnitude = np.abs(quantized)
+    integer = magnitude // 1000
+    limit = np.where(negative, 1000, 10000)
+    if (integer >= limit).any():
+        return None
+
+    out = np.full(quantized.shape + (COORD_WIDTH,), _SPACE, dtype=np.uint8)
+    out[..., 4] = _DOT
+    out[..., 7] = _DIGITS[magnitude % 10]
+    out[..., 6] = _DIGITS[magnitude // 10 % 10]
+    out[..., 5] = _DIGITS[magnitude // 100 % 10]
+
+    num_digits = np.ones(quantized.shape, dtype=np.int64)
+    for power in (10, 100, 1000):
+        num_digits += integer >= power
+    for k in range(4):
+        column = 3 - k
+        out[..., column] = np.where(
+            k < num_digits, _DIGITS[integer // 10**k % 10], out[..., column]
+        )
+    sign_column = 3 - num_digits
+    rows = np.nonzero(negative)
+    out[rows + (sign_column[rows],)] = _MINUS
+    return out
+
+
+class PDBTemplate:
+    """
+    A PDB string compiled once into a byte buffer plus the offsets of the
+    x/y/z columns of every ATOM/HETATM record, so new frames are written
+    with a few array operations instead of one f-string per atom.
+
+    Produces exactly the same string as `update_pdb_positions`, which drops a
+    trailing newline unless `trailing_newline=True`.
+
+    Usage:
+
+    ```python
+    template = PDBTemplate(open("1crn.pdb").read())
+    pdb_string = template.render(atoms.positions)
+    ```
+    """
+
+    def __init__(self, pdb_string: str, trailing_newline: bool = False):
+        self.pdb_string = pdb_string
+        chunks = []
+        offsets = []
+        size = 0
+        for line in pdb_string.splitlines():
+            if line.startswith("ATOM") or line.startswith("HETATM"):
+                prefix = line[:30].encode()
+                offsets.append(size + len(prefix))
+                chunk = prefix + b" " * 24 + line[54:].encode()
+            else:
+                chunk = line.encode()
+            chunks.append(chunk)
+            size += len(chunk) + 1
+        if trailing_newline and pdb_string.endswith("\n"):
+            chunks.append(b"")
+        self.buffer = np.frombuffer(b"\n".join(chunks), dtype=np.uint8).copy()
+        self.num_atoms = len(offsets)
+        self.index = np.asarray(offsets, dtype=np.int64)[:, None] + np.arange(
+            3 * COORD_WIDTH
+        )
+
+    def __len__(self) -> int:
+        return self.num_atoms
+
+    def render(self, positions) -> str:
+        """Return the template with its coordinates replaced by `positions` (Nx3, Angstrom)."""
+        positions = np.asarray(positions, dtype=np.float64)[: self.num_atoms]
+        if len(positions) < self.num_atoms:
+            raise ValueError(
+                f"Template has {self.num_atoms} atoms but got {len(positions)} positions."
+            )
+        if not np.isfinite(positions).all():
+            return update_pdb_positions(self.pdb_string, positions)
+        fields = format_coordinates(quantize_positions(positions), np.signbit(positions))
+        if fields is None:  # coordinates overflow the 8 character columns
+            return update_pdb_positions(self.pdb_string, positions)
+        return self._write(fields)
+
+    def render_quantized(self, quantized, negative=None) -> str:
+        """Like `render`, from positions already quantized to 0.001 Angstrom."""
+        quantized = np.asarray(quantized, dtype=np.int64)[: self.num_atoms]
+        if negative is not None:
+            negative = np.asarray(negative)[: self.num_atoms]
+        fields = format_coordinates(quantized, negative)
+        if fields is None:
+            positions = quantized / 1000
+            if negative is not None:
+                positions = np.copysign(positions, np.where(negative, -1.0, 1.0))
+            return update_pdb_positions(self.pdb_string, positions)
+        return self._write(fields)
+
+    def _write(self, fields) -> str:
+        self.buffer[self.index] = fields.reshape(self.num_atoms, 3 * COORD_WIDTH)
+        return self.buffer.tobytes().decode()
+
+
+def pdb_positions(atoms) -> np.ndarray:
+    """
+    Positions of `atoms` as `ase.io.write(..., format="proteindatabank")` writes
+    them, i.e. rotated into the standard form of the cell for periodic systems.
+    """
+    positions = atoms.get_positions()
+    if atoms.get_pbc().any():
+        _, rotation = atoms.get_cell().standard_form()
+        positions = positions.dot(rotation.T)
+    return positions
+
+
+def cryst1_line(atoms) -> str:
+    """The CRYST1 line `ase.io.write(..., format="proteindatabank")` writes for `atoms`, "" if not periodic."""
+    if not atoms.get_pbc().any():
+        return ""
+    return cell_cryst1_line(atoms.cell)
+
+
+def cell_cryst1_line(cell) -> str:
+    """The CRYST1 line of `cell`, an ase `Cell` or 3x3 array (Angstrom)."""
+    from ase.cell import Cell
+
+    return "CRYST1%9.3f%9.3f%9.3f%7.2f%7.2f%7.2f P 1" % tuple(Cell(np.asarray(cell, dtype=np.float64)).cellpar())
+
+
+def pdb_string_positions(pdb_string: str) -> np.ndarray:
+    """Positions (Nx3, Angstrom) of the ATOM/HETATM records of a PDB string."""
+    rows = [
+        (line[30:38], line[38:46], line[46:54])
+        for line in pdb_string.splitlines()
+        if line.startswith("ATOM") or line.startswith("HETATM")
+    ]
+    return np.array(rows, dtype=np.float64).reshape(-1, 3)
+
+
 def fix_pdb_bfactor_string(pdb_content):
     # scale bfactor from [0,1] to [0,100]
     vals = []
@@ -0,0 +1,77 @@
+"""
+Entry point of the upload worker processes.
+
+Only imports what uploading needs (httpx, shared memory, compression), not the
+scientific stack `logmd.logmd` pulls in (ase, openmm, ...), so that workers
+started with spawn/forkserver start fast and stay small.
+"""
+
+import time
+
+import httpx
+
+from logmd.compression import AdaptiveCompressor
+from logmd.ring import detach, take
+from logmd.upload import (
+    Batcher,
+    group_by_request,
+    report_invalid,
+    report_status,
+    report_taken,
+    request_body,
+    request_content,
+)
+from logmd.utils import get_upload_url, queue_depth
+
+# seconds between checks for rings of finished runs while the queue is empty.
+POLL_INTERVAL = 1.0
+
+
+def upload_worker_process(
+    upload_queue,
+    status_queue,
+    batch_size: int = 1,
+    linger_ms: float = 0.0,
+) -> None:
+    """Worker process that handles uploads, of the runs sharing the pool"""
+    client = httpx.Client(timeout=180)
+    compressor = AdaptiveCompressor()
+    batcher = Batcher(batch_size, linger_ms)
+    attached: dict = {}  # shared memory rings
+
+    done = False
+    while not done:
+        batch, done = batcher.next_batch(upload_queue, timeout=POLL_INTERVAL)
+        detach(attached, closed_only=True)
+        if not batch:
+            continue
+        report_taken(status_queue, batch)
+        batch = [take(item, attached) for item in batch]
+        backlog = queue_depth(upload_queue)
+        batcher.adapt(backlog)
+
+        # frames of different runs may have different tokens/projects/compression.
+        for (token, project, compress), records in group_by_request(batch):
+            try:
+                body = request_body(records, token, project)
+                content, headers = request_content(
+                    body, compressor if compress else None, backlog
+                )
+            except Exception as e:
+                report_invalid(status_queue, records, e)
+                continue
+            t0 = time.perf_counter()
+            try:
+                status_code = client.post(
+                    get_upload_url(), content=content, headers=headers
+                ).status_code
+            except httpx.HTTPError:
+                status_code = 0
+            latency = time.perf_counter() - t0
+            if compress:
+                compressor.observe_upload(len(content), latency)
+            report_status(
+                status_queue, records, status_code, len(body), len(content), latency
+            )
+    detach(attached)
+    client.close()
@@ -0,0 +1,86 @@
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class Server(ThreadingHTTPServer):
+    request_queue_size = 128  # the async engine opens many connections at once
+
+
+class UploadServer:
+    """
+    Local stand-in for the upload backend, keeps the JSON body of every request.
+    The next `failures` requests are answered with 503 and not kept.
+    """
+
+    def __init__(self):
+        self.requests: list = []
+        self.failures = 0
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                encoding = self.headers.get("Content-Encoding")
+                if encoding == "deflate":
+                    body = zlib.decompress(body)
+                with server.lock:
+                    failed = server.failures > 0
+                    if failed:
+                        server.failures -= 1
+                    else:
+                        server.requests.append((encoding, json.loads(body)))
+                self.send_response(503 if failed else 200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = Server(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    @property
+    def frames(self) -> list:
+        """The frames received, requests with a `frames` list are flattened."""
+        with self.lock:
+            bodies = [body for _, body in self.requests]
+        return [frame for body in bodies for frame in body.get("frames", [body])]
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def upload_server(monkeypatch):
+    """Starts an `UploadServer` and points the upload workers at it."""
+    import logmd.upload
+    import logmd.worker
+
+    server = UploadServer()
+    monkeypatch.setattr(logmd.upload, "get_upload_url", lambda: server.url)
+    monkeypatch.setattr(logmd.worker, "get_upload_url", lambda: server.url)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    """Makes the next LogMD create its own `SharedUploadPool`, closed after the test."""
+    import atexit
+
+    import logmd.pool
+
+    monkeypatch.setattr(logmd.pool, "_shared_pool", None)
+    yield
+    pool = logmd.pool._shared_pool
+    if pool is not None:
+        atexit.unregister(pool.close)
+        pool.close()
@@ -0,0 +1,213 @@
+import numpy as np
+import pytest
+
+from logmd.codec import (
+    DELTA,
+    KEYFRAME,
+    ChannelDecoder,
+    ChannelEncoder,
+    FrameDecoder,
+    FrameEncoder,
+    KeyframeRewriter,
+    decode_frame,
+    quantize,
+)
+from logmd.utils import update_pdb_positions
+
+NUM_ATOMS = 20
+
+
+def topology(num_atoms: int = NUM_ATOMS) -> str:
+    lines = ["CRYST1    0.000    0.000    0.000  90.00  90.00  90.00 P 1"]
+    for i in range(num_atoms):
+        lines.append(
+            f"ATOM  {i + 1:5d}  C   MOL A   1    {0:8.3f}{0:8.3f}{0:8.3f}  1.00  0.00           C"
+        )
+    lines.append("END")
+    return "\n".join(lines)
+
+
+def trajectory(num_frames: int = 12, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-50, 50, (NUM_ATOMS, 3))
+    frames = []
+    for _ in range(num_frames):
+        positions = positions + rng.normal(0, 0.05, positions.shape)
+        frame = positions.copy()
+        # entries that print as "-0.000" must keep their sign.
+        frame[0] = (-0.0001, -0.0004, 0.0002)
+        frames.append(frame)
+    return frames
+
+
+@pytest.mark.parametrize("keyframe_interval", [1, 3, 100])
+def test_lossless_round_trip_is_exact(keyframe_interval):
+    encoder = FrameEncoder(keyframe_interval)
+    encoder.set_topology(topology())
+    decoder = FrameDecoder()
+    kinds = []
+    for frame_num, positions in enumerate(trajectory(), start=1):
+        record = encoder.encode(positions, frame_num)
+        record["frame_num"] = str(frame_num)
+        kinds.append(decode_frame(record["frame"]).kind)
+
+        pdb_string = decoder.decode(record)
+
+        quantized, negative_zeros = quantize(positions)
+        np.testing.assert_array_equal(decoder.previous, quantized)
+        assert list(decode_frame(record["frame"]).negative_zeros) == list(
+            negative_zeros
+        )
+        assert pdb_string == update_pdb_positions(topology(), positions)
+        assert pdb_string.splitlines()[1][30:54] == "  -0.000  -0.000   0.000"
+    expected = [
+        KEYFRAME if k % keyframe_interval == 0 else DELTA for k in range(len(kinds))
+    ]
+    assert kinds == expected
+
+
+def test_topology_is_sent_once_and_again_on_request():
+    encoder = FrameEncoder(2)
+    encoder.set_topology(topology())
+    frames = trajectory(4)
+    records = [encoder.encode(frames[0], 1), encoder.encode(frames[1], 2)]
+    encoder.resend_topology()
+    records.append(encoder.encode(frames[2], 3))
+    assert ["topology" in record for record in records] == [True, False, True]
+
+
+def test_delta_to_missing_frame_is_rejected():
+    encoder = FrameEncoder(10)
+    encoder.set_topology(topology())
+    frames = trajectory(3)
+    first = encoder.encode(frames[0], 1)
+    encoder.encode(frames[1], 2)
+    third = encoder.encode(frames[2], 3)
+    decoder = FrameDecoder()
+    decoder.decode({**first, "frame_num": "1"})
+    with pytest.raises(ValueError, match="delta to missing frame 2"):
+        decoder.decode({**third, "frame_num": "3"})
+
+
+def test_lossy_error_is_bounded():
+    max_error = 0.01
+    encoder = FrameEncoder(5, max_error)
+    encoder.set_topology(topology())
+    decoder = FrameDecoder()
+    for frame_num, positions in enumerate(trajectory(20), start=1):
+        record = {**encoder.encode(positions, frame_num), "frame_num": str(frame_num)}
+        decoder.decode(record)
+        assert np.abs(decoder.previous / 1000 - positions).max() <= max_error
+
+
+@pytest.mark.parametrize("max_error", [None, 0.01])
+def test_rewritten_frames_decode_alone(max_error):
+    encoder, forces_encoder = FrameEncoder(4, max_error), ChannelEncoder(3, 0.01, 4)
+    encoder.set_topology(topology())
+    decoder, forces_decoder = FrameDecoder(), ChannelDecoder()
+    rewriter = KeyframeRewriter()
+    for frame_num, positions in enumerate(trajectory(), start=1):
+        record = {**encoder.encode(positions, frame_num), "frame_num": str(frame_num)}
+        record["forces"] = forces_encoder.encode(positions, frame_num)
+        rewritten = rewriter.rewrite(record)
+
+        assert decode_frame(rewritten["frame"]).kind == KEYFRAME
+        assert FrameDecoder(topology()).decode(rewritten) == decoder.decode(record)
+        np.testing.assert_array_equal(
+            ChannelDecoder().decode(rewritten["forces"], frame_num),
+            forces_decoder.decode(record["forces"], frame_num),
+        )
+
+
+def test_decoded_pdb_matches_ase_pdb_string():
+    ase = pytest.importorskip("ase.build")
+    from logmd.logmd import LogMD
+
+    atoms = ase.molecule("CH3CH2OH")
+    encoder = FrameEncoder(4)
+    encoder.set_topology(LogMD.ase_pdb_string(atoms))
+    decoder = FrameDecoder()
+    rng = np.random.default_rng(1)
+    for frame_num in range(1, 10):
+        atoms.positions += rng.normal(0, 0.02, atoms.positions.shape)
+        record = {
+            **encoder.encode(atoms.positions, frame_num),
+            "frame_num": str(frame_num),
+        }
+        assert decoder.decode(record) == LogMD.ase_pdb_string(atoms)
+
+
+@pytest.mark.parametrize("max_error", [0.0, 0.001, 32.8, 100.0, float("nan")])
+def test_max_error_out_of_range_is_rejected(max_error):
+    with pytest.raises(ValueError, match="max_error must be between"):
+        FrameEncoder(5, max_error)
+
+
+@pytest.mark.parametrize("max_error", [0.0015, 32.767])
+def test_max_error_bounds_encode(max_error):
+    encoder = FrameEncoder(5, max_error)
+    encoder.set_topology(topology())
+    decoder = FrameDecoder()
+    for frame_num, positions in enumerate(trajectory(3), start=1):
+        decoder.decode(
+            {**encoder.encode(positions * 100, frame_num), "frame_num": str(frame_num)}
+        )
+        assert np.abs(decoder.previous / 1000 - positions * 100).max() <= max_error
+
+
+def test_logmd_rejects_max_error_out_of_range():
+    pytest.importorskip("ase")
+    from logmd import LogMD
+
+    with pytest.raises(ValueError, match="max_error"):
+        LogMD(max_error=50.0)
+
+
+def test_variable_cell_round_trip():
+    ase_build = pytest.importorskip("ase.build")
+    from logmd.logmd import LogMD
+    from logmd.utils import cryst1_line, pdb_positions
+
+    atoms = ase_build.bulk("Cu", cubic=True) * (2, 2, 2)
+    encoder = FrameEncoder(4)
+    encoder.set_topology(LogMD.ase_pdb_string(atoms))
+    decoder = FrameDecoder()
+    for frame_num in range(1, 10):
+        if frame_num < 7:
+            atoms.set_cell(atoms.cell * 1.01, scale_atoms=True)
+        record = encoder.encode(pdb_positions(atoms), frame_num, cryst1_line(atoms))
+        record = {**record, "frame_num": str(frame_num)}
+        assert decoder.decode(record) == LogMD.ase_pdb_string(atoms)
+
+
+def test_cryst1_is_only_sent_when_the_cell_changed():
+    ase_build = pytest.importorskip("ase.build")
+    from logmd.logmd import LogMD
+    from logmd.utils import cryst1_line, pdb_positions
+
+    atoms = ase_build.bulk("Cu", cubic=True)
+    encoder = FrameEncoder(4)
+    encoder.set_topology(LogMD.ase_pdb_string(atoms))
+    assert "cryst1" not in encoder.encode(pdb_positions(atoms), 1, cryst1_line(atoms))
+    atoms.set_cell(atoms.cell * 1.01, scale_atoms=True)
+    assert encoder.encode(pdb_positions(atoms), 2, cryst1_line(atoms))[
+        "cryst1"
+    ] == cryst1_line(atoms)
+
+
+def test_logmd_binary_frames_follow_the_cell(upload_server, fresh_pool):
+    ase_build = pytest.importorskip("ase.build")
+    from logmd.logmd import LogMD
+
+    atoms = ase_build.bulk("Cu", cubic=True) * (2, 2, 2)
+    logmd = LogMD(frame_format="binary", keyframe_interval=4)
+    expected = []
+    for _ in range(8):
+        atoms.set_cell(atoms.cell * 1.01, scale_atoms=True)
+        logmd(atoms)
+        expected.append(LogMD.ase_pdb_string(atoms))
+    logmd.cleanup()
+
+    decoder = FrameDecoder()
+    received = sorted(upload_server.frames, key=lambda frame: int(frame["frame_num"]))
+    assert [decoder.decode(frame) for frame in received] == expected
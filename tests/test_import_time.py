@@ -0,0 +1,51 @@
+"""
+Import time regression test, fails when an import exceeds its budget or loads
+a module it should only load on demand.
+
+Times are the cumulative `python -X importtime` numbers of the imported module
+(interpreter startup excluded), the best of `REPEAT` runs in a fresh interpreter.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# statement -> (module measured, budget in ms)
+BUDGETS = {
+    "import logmd": ("logmd", 20),
+    "import logmd.worker": ("logmd.worker", 300),
+    "from logmd import LogMD": ("logmd.logmd", 600),
+    "import logmd.cli.main": ("logmd.cli.main", 150),
+}
+# modules only the code paths that need them import.
+LAZY = ("ase.io", "openmm", "tqdm", "requests", "MDAnalysis", "logmd.words")
+REPEAT = 3
+
+
+def import_time(statement: str, module: str):
+    """Returns (cumulative import time in ms of `module`, imported modules)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    ms, imported = 0.0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        imported.add(name.strip())
+        if name.strip() == module:
+            ms = int(cumulative) / 1000
+    return ms, imported
+
+
+@pytest.mark.parametrize("statement", BUDGETS)
+def test_import_time(statement):
+    module, budget = BUDGETS[statement]
+    runs = [import_time(statement, module) for _ in range(REPEAT)]
+    assert module in runs[0][1]
+    assert sorted(name for name in LAZY if name in runs[0][1]) == []
+    assert min(ms for ms, _ in runs) <= budget
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from logmd.local import COORDS, INDEX, INDEX_DTYPE, CoordinateWriter, LocalRun
+
+NUM_ATOMS = 4
+
+
+def topology(num_atoms: int = NUM_ATOMS) -> str:
+    lines = [
+        f"ATOM  {i + 1:5d}  C   MOL A   1    {0:8.3f}{0:8.3f}{0:8.3f}  1.00  0.00           C"
+        for i in range(num_atoms)
+    ]
+    return "\n".join(lines + ["END", ""])
+
+
+def frames(num_frames: int) -> np.ndarray:
+    return (
+        np.arange(num_frames * NUM_ATOMS * 3, dtype=np.float64).reshape(
+            num_frames, NUM_ATOMS, 3
+        )
+        / 8
+    )
+
+
+def write(path: str, positions, first_frame_num: int = 1) -> None:
+    writer = CoordinateWriter(path)
+    for frame_num, frame in enumerate(positions, start=first_frame_num):
+        writer.append(frame_num, frame, np.eye(3) * frame_num, topology())
+    writer.close()
+
+
+def test_slices_and_strides(tmp_path):
+    positions = frames(20)
+    write(str(tmp_path), positions)
+
+    run = LocalRun(str(tmp_path))
+    assert len(run) == 20
+    np.testing.assert_array_equal(run[3], positions[3])
+    np.testing.assert_array_equal(run[-1], positions[-1])
+    np.testing.assert_array_equal(run[-10::3], positions[-10::3])
+    np.testing.assert_array_equal(run[::7], positions[::7])
+    np.testing.assert_array_equal(run[[1, 5]], positions[[1, 5]])
+    assert list(run.frame_nums[::5]) == [1, 6, 11, 16]
+    np.testing.assert_array_equal(run.cells[4], np.eye(3) * 5)
+
+
+def test_torn_last_frame_is_truncated(tmp_path):
+    positions = frames(3)
+    write(str(tmp_path), positions)
+    # the process died while writing the fourth frame.
+    with open(tmp_path / COORDS, "ab") as f:
+        f.write(b"\x00" * 20)
+    with open(tmp_path / INDEX, "ab") as f:
+        f.write(b"\x00" * (INDEX_DTYPE.itemsize + 3))
+    assert len(LocalRun(str(tmp_path))) == 3
+
+    write(str(tmp_path), frames(2) + 100, first_frame_num=4)
+    assert os.path.getsize(tmp_path / COORDS) == 5 * NUM_ATOMS * 12
+    assert os.path.getsize(tmp_path / INDEX) == 5 * INDEX_DTYPE.itemsize
+    run = LocalRun(str(tmp_path))
+    assert list(run.frame_nums) == [1, 2, 3, 4, 5]
+    np.testing.assert_array_equal(run[3], frames(2)[0] + 100)
+
+
+def test_other_number_of_atoms_is_rejected(tmp_path):
+    writer = CoordinateWriter(str(tmp_path))
+    writer.append(1, frames(1)[0], topology=topology())
+    with pytest.raises(ValueError, match="has 4 atoms"):
+        writer.append(2, np.zeros((3, 3)))
+    writer.close()
+
+
+def test_pdb_is_the_logged_frame_of_a_periodic_system(
+    tmp_path, monkeypatch, upload_server, fresh_pool
+):
+    ase_build = pytest.importorskip("ase.build")
+    from logmd import LogMD
+
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    atoms = ase_build.bulk("Cu", "fcc", a=3.6, cubic=True).repeat(3)
+    logmd = LogMD(store_locally=True, local_format="memmap")
+    for i in range(20):
+        # coordinates on and next to 0.0005 rounding boundaries, where float32 and float64 round differently.
+        ties = (rng.integers(-400_000, 400_000, (len(atoms), 3)) + 0.5) / 1000
+        atoms.positions = ties + rng.choice([0.0, 1e-9, -1e-9, 3e-5, -3e-5], ties.shape)
+        atoms.positions[0] = (-0.0001, -0.0004, 0.0002)
+        if i >= 10:  # NPT, the cell changes
+            atoms.set_cell(atoms.cell * 1.001)
+        logmd(atoms)
+    logmd.cleanup()
+
+    logged = {
+        int(frame["frame_num"]): frame["file_contents"]
+        for frame in upload_server.frames
+    }
+    run = LogMD.open_local(logmd.run_id)
+    assert len(run) == 20
+    for i, frame_num in enumerate(run.frame_nums):
+        assert run.pdb(i) == logged[frame_num]
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+from logmd.spool import RunLog
+
+ase_build = pytest.importorskip("ase.build")
+
+
+def recorded(path, run_id: str) -> list:
+    log = RunLog(str(path / "logmd" / run_id))
+    frame_nums = [int(frame_num) for _, frame_num in log.entries()]
+    log.close()
+    return frame_nums
+
+
+def test_data_dict_of_the_caller_is_not_modified(tmp_path, monkeypatch):
+    from logmd import LogMD
+
+    monkeypatch.chdir(tmp_path)
+    atoms = ase_build.molecule("CH3CH2OH")
+    data_dict = {"step": "1"}
+    for encode_in_background in (False, True):
+        logmd = LogMD(offline=True, encode_in_background=encode_in_background)
+        logmd(atoms, data_dict=data_dict)
+        logmd.cleanup()
+    assert data_dict == {"step": "1"}
+
+
+def test_background_encoding_applies_the_backpressure_policy(tmp_path, monkeypatch):
+    from logmd import LogMD
+
+    monkeypatch.chdir(tmp_path)
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(
+        offline=True,
+        encode_in_background=True,
+        max_queue_frames=2,
+        backpressure="drop_newest",
+    )
+    encode = logmd.encode
+
+    def slow_encode(snapshot):
+        time.sleep(0.05)
+        encode(snapshot)
+
+    monkeypatch.setattr(logmd, "encode", slow_encode)
+    t0 = time.monotonic()
+    for _ in range(20):
+        logmd(atoms)
+    assert time.monotonic() - t0 < 0.5  # the simulation did not wait for the encoder
+    logmd.cleanup()
+
+    assert logmd.dropped_snapshots > 0
+    assert logmd.stats()["dropped"] == logmd.dropped_snapshots
+    frame_nums = recorded(tmp_path, logmd.run_id)
+    assert len(frame_nums) == 20 - logmd.dropped_snapshots
+    assert frame_nums[:2] == [1, 2] and frame_nums == sorted(frame_nums)
+
+
+def test_metrics_interval_requires_rollups():
+    from logmd import LogMD
+
+    with pytest.raises(AssertionError, match="requires rollups"):
+        LogMD(offline=True, metrics_interval=10)
+
+
+def test_rollups_of_dropped_frames_are_uploaded(upload_server, fresh_pool):
+    from logmd import LogMD
+    from logmd.metrics import MetricRollups
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(
+        rollups=True, metrics_interval=4, max_queue_frames=3, backpressure="drop_oldest"
+    )
+    expected = MetricRollups()
+    buckets = []
+
+    def log(frame_nums):
+        for frame_num in frame_nums:
+            logmd(atoms, metrics={"x": (frame_num, "")})
+            buckets.extend(expected.add(frame_num, {"energy": 0.0, "x": frame_num}))
+
+    log(range(1, 3))
+    logmd.pool.flush(logmd.run_id)
+    run = logmd.pool.runs.pop(
+        logmd.run_id
+    )  # pause the consumer, the run queue overflows.
+    log(range(3, 60))
+    logmd.pool.runs[logmd.run_id] = run
+    log(range(60, 70))
+    logmd.cleanup()
+
+    assert logmd.dropped_frames > 0
+    received = [
+        bucket for frame in upload_server.frames for bucket in frame.get("rollups", [])
+    ]
+    assert sorted(received) == sorted(buckets)
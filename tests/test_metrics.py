@@ -0,0 +1,174 @@
+import os
+
+import numpy as np
+import pytest
+
+from logmd.metrics import (
+    FLOAT,
+    INT,
+    MetricsDecoder,
+    MetricsEncoder,
+    MetricsTable,
+    MetricsWriter,
+    _column_file,
+)
+
+
+def test_int_column_is_promoted_to_float(tmp_path):
+    writer = MetricsWriter(str(tmp_path), chunk_rows=2)
+    for frame_num in range(1, 5):
+        writer.append(frame_num, {"step": frame_num * 10})
+    assert os.path.exists(tmp_path / _column_file("step", INT))
+
+    writer.append(5, {"step": 50.5})
+    writer.close()
+    assert not os.path.exists(tmp_path / _column_file("step", INT))
+    table = MetricsTable(str(tmp_path))
+    assert table.dtypes["step"] == FLOAT
+    np.testing.assert_array_equal(table["step"], [10, 20, 30, 40, 50.5])
+    np.testing.assert_array_equal(table.frame_nums, [1, 2, 3, 4, 5])
+
+
+def test_missing_values_are_nan(tmp_path):
+    writer = MetricsWriter(str(tmp_path), chunk_rows=3)
+    for frame_num in range(1, 6):
+        values = {"energy": (-1.5 * frame_num, "eV"), "step": frame_num}
+        if frame_num == 2:
+            del values["step"]  # an int column with a missing value becomes float
+        if frame_num >= 4:
+            values["late"] = "7 [K]"
+            values["late_count"] = frame_num
+        writer.append(frame_num, values)
+    writer.close()
+
+    table = MetricsTable(str(tmp_path))
+    assert len(table) == 5
+    assert table.units == {"energy": "eV", "step": "", "late": "K", "late_count": ""}
+    np.testing.assert_array_equal(table["step"], [1, np.nan, 3, 4, 5])
+    np.testing.assert_array_equal(table["late"], [np.nan, np.nan, np.nan, 7, 7])
+    np.testing.assert_array_equal(table["late_count"], [np.nan, np.nan, np.nan, 4, 5])
+    assert table.dtypes == {
+        "energy": FLOAT,
+        "step": FLOAT,
+        "late": FLOAT,
+        "late_count": FLOAT,
+    }
+
+
+def test_partial_chunk_is_dropped_on_reopen(tmp_path):
+    writer = MetricsWriter(str(tmp_path), chunk_rows=2)
+    for frame_num in range(1, 5):
+        writer.append(frame_num, {"energy": float(frame_num), "step": frame_num})
+    writer.close()
+    # the process died writing the next chunk, after the energy but before the frame_num column.
+    with open(tmp_path / _column_file("energy", FLOAT), "ab") as f:
+        f.write(np.array([5.0, 6.0]).tobytes())
+    with open(tmp_path / _column_file("step", INT), "ab") as f:
+        f.write(b"\x05\x00\x00")
+    assert len(MetricsTable(str(tmp_path))) == 4
+
+    writer = MetricsWriter(str(tmp_path), chunk_rows=2)
+    writer.append(7, {"energy": 7.0, "step": 7})
+    writer.close()
+    table = MetricsTable(str(tmp_path))
+    np.testing.assert_array_equal(table.frame_nums, [1, 2, 3, 4, 7])
+    np.testing.assert_array_equal(table["energy"], [1, 2, 3, 4, 7])
+    np.testing.assert_array_equal(table["step"], [1, 2, 3, 4, 7])
+    for name, dtype in [("frame_num", INT), ("energy", FLOAT), ("step", INT)]:
+        assert os.path.getsize(tmp_path / _column_file(name, dtype)) == 5 * 8
+
+
+def test_packed_metrics_round_trip():
+    encoder, decoder = MetricsEncoder(), MetricsDecoder()
+    frames = [
+        {"step": 1, "energy": (-1.5, "eV"), "converged": True, "note": "start"},
+        {"step": 2, "energy": (-1.25, "eV"), "converged": np.bool_(False)},
+        {
+            "step": 2.5,
+            "energy": (-1.0, "eV"),
+            "converged": False,
+        },  # step becomes float64
+        {
+            "energy": (-0.5, "eV"),
+            "temperature": "300.5 [K]",
+        },  # step missing, temperature new
+        {
+            "step": 4,
+            "energy": (-0.25, "eV"),
+            "temperature": "301 [K]",
+            "converged": True,
+        },
+    ]
+    records = [encoder.encode(values) for values in frames]
+    assert ["metrics_schema" in record for record in records] == [
+        True,
+        False,
+        True,
+        True,
+        False,
+    ]
+    assert records[0]["data_dict"] == {"note": "start"}
+
+    decoded = [decoder.decode(record) for record in records]
+    assert decoded[0] == {"step": 1, "energy": -1.5, "converged": 1, "note": "start"}
+    assert isinstance(decoded[0]["step"], int) and isinstance(decoded[2]["step"], float)
+    assert decoded[1]["converged"] == 0
+    assert decoded[2] == {"step": 2.5, "energy": -1.0, "converged": 0}
+    assert np.isnan(decoded[3]["step"]) and np.isnan(decoded[3]["converged"])
+    assert decoded[3]["temperature"] == 300.5
+    assert decoded[4] == {
+        "step": 4.0,
+        "energy": -0.25,
+        "converged": 1.0,
+        "temperature": 301.0,
+    }
+    assert decoder.units == {
+        "step": "",
+        "energy": "eV",
+        "converged": "",
+        "temperature": "K",
+    }
+
+
+def test_schema_is_resent_after_a_drop():
+    encoder = MetricsEncoder()
+    first = encoder.encode({"step": 1})
+    encoder.encode({"step": 1.5, "energy": (2.0, "eV")})  # dropped, with the new schema
+    encoder.resend_schema()
+    third = encoder.encode({"step": 3, "energy": (4.0, "eV")})
+
+    decoder = MetricsDecoder()
+    assert decoder.decode(first) == {"step": 1}
+    assert third["metrics_schema"] == [["step", FLOAT, ""], ["energy", FLOAT, "eV"]]
+    assert decoder.decode(third) == {"step": 3.0, "energy": 4.0}
+
+    with pytest.raises(ValueError, match="before their schema"):
+        MetricsDecoder().decode({"frame_num": "3", "metrics": third["metrics"]})
+
+
+def test_logged_metrics_decode_after_drops(upload_server, fresh_pool):
+    ase_build = pytest.importorskip("ase.build")
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("H2O")
+    logmd = LogMD(
+        metrics_format="packed", max_queue_frames=3, backpressure="drop_oldest"
+    )
+    logmd(atoms, data_dict={"step": 1})
+    logmd.pool.flush(logmd.run_id)
+    # pause the consumer, the frames changing the schema are dropped.
+    run = logmd.pool.runs.pop(logmd.run_id)
+    logmd(atoms, data_dict={"step": 2.5, "pressure": "1.5 [bar]"})
+    for step in range(3, 8):
+        logmd(atoms, data_dict={"step": step, "pressure": "1 [bar]"})
+    logmd.pool.runs[logmd.run_id] = run
+    logmd.cleanup()
+
+    assert logmd.dropped_frames > 0
+    decoder = MetricsDecoder()
+    for frame in sorted(
+        upload_server.frames, key=lambda frame: int(frame["frame_num"])
+    ):
+        values = decoder.decode(frame)
+        assert values["step"] == int(frame["frame_num"])
+        assert values.get("pressure", 1.0) == 1.0
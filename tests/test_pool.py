@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+ase_build = pytest.importorskip("ase.build")
+
+# a frame referring to a missing shared memory ring makes the worker reading it crash.
+POISON = {"_slot": ("missing", 0, 0, 0, "frame", False)}
+
+
+def test_crashed_workers_are_replaced(upload_server, fresh_pool):
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(num_workers=2)
+    logmd(atoms)
+    workers = logmd.pool.workers
+    logmd.pool.flush(logmd.run_id)
+    first = list(workers.processes)
+
+    for _ in range(2):
+        logmd.pool.upload_queue.put(dict(POISON), 0)
+    deadline = time.monotonic() + 10
+    while any(process.is_alive() for process in first) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not any(process.is_alive() for process in first)
+
+    for _ in range(20):
+        atoms.positions += 0.01
+        logmd(atoms)
+    logmd.cleanup()
+
+    assert sorted(int(frame["frame_num"]) for frame in upload_server.frames) == list(
+        range(1, 22)
+    )
+    assert workers.size == 2
+    assert len([process for process in workers.processes if process.is_alive()]) == 2
+
+
+def test_frames_of_a_crashed_worker_fail(upload_server, fresh_pool):
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(num_workers=1, batch_size=4, linger_ms=500)
+    logmd(atoms)
+    logmd.pool.flush(logmd.run_id)
+
+    # the worker lingers on the poisoned frame, takes the next three with it and crashes.
+    logmd.pool.upload_queue.put(dict(POISON), 0)
+    for _ in range(3):
+        logmd(atoms)
+    t0 = time.monotonic()
+    logmd.cleanup()
+
+    assert time.monotonic() - t0 < 10
+    assert logmd.stats()["errors_by_status"] == {0: 3}
+    assert [frame["frame_num"] for frame in upload_server.frames] == ["1"]
+
+
+def test_flush_gives_up_without_progress(fresh_pool):
+    from logmd.pool import shared_pool
+    from logmd.queues import BoundedQueue
+    from logmd.stats import UploadStats
+
+    pool = shared_pool()
+    stats = UploadStats()
+    pool.register("run", BoundedQueue(10, 1 << 20, shared=False), stats)
+    stats.submit()
+    t0 = time.monotonic()
+    assert pool.flush("run", stall_timeout=0.2) == 1
+    assert time.monotonic() - t0 < 2
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from logmd.codec import ChannelDecoder, FrameDecoder
+from logmd.queues import BoundedQueue
+
+
+def drain(upload_queue: BoundedQueue) -> list:
+    items = []
+    while upload_queue.qsize():
+        items.append(upload_queue.get_nowait())
+    return items
+
+
+def test_drop_oldest_drops_the_dependent_frames_of_a_dropped_one():
+    upload_queue = BoundedQueue(4, 1 << 30, "drop_oldest", shared=False)
+    for frame, dependent in (("K1", False), ("D2", True), ("D3", True), ("K4", False)):
+        assert upload_queue.put(frame, 1, dependent) == []
+    assert upload_queue.put("D5", 1, True) == ["K1", "D2", "D3"]
+    assert drain(upload_queue) == ["K4", "D5"]
+
+
+def test_drop_oldest_drops_a_dependent_frame_whose_predecessor_was_dropped():
+    upload_queue = BoundedQueue(3, 1 << 30, "drop_oldest", shared=False)
+    for frame in ("K1", "D2", "D3"):
+        upload_queue.put(frame, 1, frame.startswith("D"))
+    assert upload_queue.put("D4", 1, True) == ["K1", "D2", "D3", "D4"]
+    assert upload_queue.qsize() == 0
+    assert upload_queue.put("K5", 1) == []
+    assert drain(upload_queue) == ["K5"]
+
+
+def test_coalesce_keeps_an_independent_frame():
+    upload_queue = BoundedQueue(2, 1 << 30, "coalesce", shared=False)
+    upload_queue.put("K1", 1)
+    upload_queue.put("D2", 1, True)
+    assert upload_queue.put("K3", 1) == ["K1", "D2"]
+    assert drain(upload_queue) == ["K3"]
+
+
+@pytest.mark.parametrize("backpressure", ["drop_oldest", "coalesce"])
+def test_every_received_frame_decodes_after_drops(
+    upload_server, fresh_pool, backpressure
+):
+    ase_build = pytest.importorskip("ase.build")
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    forces = np.zeros((len(atoms), 3))
+    logmd = LogMD(
+        frame_format="binary",
+        keyframe_interval=4,
+        max_queue_frames=3,
+        backpressure=backpressure,
+        channels={"forces": 0.001},
+    )
+    rng = np.random.default_rng(0)
+
+    def log(num_frames):
+        for _ in range(num_frames):
+            atoms.positions += rng.normal(0, 0.01, atoms.positions.shape)
+            forces[:] = rng.normal(0, 1, forces.shape)
+            logmd(atoms, channels={"forces": forces})
+
+    log(2)
+    logmd.pool.flush(logmd.run_id)
+    # pause the consumer, the run queue overflows.
+    run = logmd.pool.runs.pop(logmd.run_id)
+    log(9)
+    logmd.pool.runs[logmd.run_id] = run
+    log(3)
+    logmd.cleanup()
+
+    assert logmd.dropped_frames > 0
+    received = sorted(upload_server.frames, key=lambda frame: int(frame["frame_num"]))
+    assert len(received) == 14 - logmd.dropped_frames
+    decoder, forces_decoder = FrameDecoder(), ChannelDecoder()
+    for frame in received:
+        decoder.decode(frame)
+        forces_decoder.decode(frame["forces"], int(frame["frame_num"]))
@@ -0,0 +1,76 @@
+import os
+import time
+
+import pytest
+
+ase_build = pytest.importorskip("ase.build")
+
+
+def mapped(pid: int, name: str) -> bool:
+    with open(f"/proc/{pid}/maps") as f:
+        return name in f.read()
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/maps"), reason="needs /proc")
+def test_workers_detach_the_ring_of_a_finished_run(upload_server, fresh_pool):
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    names = []
+    for _ in range(3):
+        logmd = LogMD(transport="shm", num_workers=2)
+        for _ in range(20):
+            atoms.positions += 0.01
+            logmd(atoms)
+        names.append(logmd.ring.name)
+        workers = list(logmd.pool.workers.processes)
+        logmd.cleanup()
+
+    assert len(upload_server.frames) == 60
+    deadline = time.monotonic() + 5
+    while (
+        any(mapped(w.pid, name) for w in workers for name in names)
+        and time.monotonic() < deadline
+    ):
+        time.sleep(0.1)
+    left = [(w.pid, name) for w in workers for name in names if mapped(w.pid, name)]
+    assert not left
+
+
+def test_ring_is_bounded_by_shm_bytes(upload_server, fresh_pool):
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(transport="shm", num_workers=2, shm_bytes=1 << 20)
+    logmd(atoms)
+    assert logmd.ring.num_slots * (1 + logmd.ring.slot_size) <= 1 << 20
+    logmd.cleanup()
+    assert len(upload_server.frames) == 1
+
+
+@pytest.mark.parametrize("cause", ["shm_bytes", "allocation"])
+def test_frames_go_through_the_queue_without_a_ring(
+    upload_server, fresh_pool, monkeypatch, cause
+):
+    from logmd import LogMD
+    from logmd.ring import SharedFrameRing
+
+    if cause == "allocation":
+
+        def no_space(fd, offset, length):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(os, "posix_fallocate", no_space, raising=False)
+        with pytest.raises(OSError):
+            SharedFrameRing(8, 1 << 16)
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(
+        transport="shm", num_workers=2, shm_bytes=1000 if cause == "shm_bytes" else None
+    )
+    for _ in range(5):
+        atoms.positions += 0.01
+        logmd(atoms)
+    assert (logmd.ring, logmd.transport) == (None, "queue")
+    logmd.cleanup()
+    assert len(upload_server.frames) == 5
@@ -0,0 +1,134 @@
+import os
+import pickle
+
+import pytest
+
+from logmd.spool import ENTRY_HEADER, WAL, RunLog
+
+
+def test_run_log_round_trip(tmp_path):
+    log = RunLog(str(tmp_path / "run"))
+    record = {
+        "frame_num": "3",
+        "frame": b"LMDF\x00\xff",
+        "data_dict": {"step": "3"},
+        "rollups": [["energy", 4, 1, 16, -1.5, 0.25, 2.0]],
+    }
+    offset = log.append("project", record)
+    log.append("", {"frame_num": "4", "file_contents": "ATOM"})
+
+    assert log.read(offset) == ("project", record)
+    assert [frame_num for _, frame_num in log.entries()] == ["3", "4"]
+    log.close()
+
+
+class Exploit:
+    def __reduce__(self):
+        return (open, (os.path.join(os.environ["LOGMD_TEST_DIR"], "pwned"), "w"))
+
+
+def test_run_log_does_not_unpickle(tmp_path, monkeypatch):
+    monkeypatch.setenv("LOGMD_TEST_DIR", str(tmp_path))
+    os.makedirs(tmp_path / "run")
+    data = pickle.dumps(("", {"frame_num": "1", "x": Exploit()}))
+    with open(tmp_path / "run" / WAL, "wb") as f:
+        f.write(ENTRY_HEADER.pack(len(data)) + data)
+
+    log = RunLog(str(tmp_path / "run"))
+    with pytest.raises(ValueError):
+        list(log.entries())
+    log.close()
+    assert not os.path.exists(tmp_path / "pwned")
+
+
+def test_offline_run_syncs(tmp_path, monkeypatch, upload_server, fresh_pool):
+    ase_build = pytest.importorskip("ase.build")
+    from logmd import LogMD
+    from logmd.codec import FrameDecoder
+    from logmd.sync import sync
+
+    monkeypatch.chdir(tmp_path)
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(offline=True, frame_format="binary")
+    for _ in range(5):
+        atoms.positions += 0.01
+        logmd(atoms)
+    logmd.cleanup()
+    assert upload_server.frames == []
+
+    sync(str(tmp_path / "logmd"), num_workers=1)
+    received = sorted(upload_server.frames, key=lambda frame: int(frame["frame_num"]))
+    assert [frame["frame_num"] for frame in received] == ["1", "2", "3", "4", "5"]
+    decoder = FrameDecoder()
+    pdb_strings = [decoder.decode(frame) for frame in received]
+    assert pdb_strings[-1] == LogMD.ase_pdb_string(atoms)
+
+
+@pytest.mark.parametrize("engine", ["process", "async"])
+def test_resumed_frames_keep_their_project(
+    tmp_path, monkeypatch, upload_server, fresh_pool, engine
+):
+    ase_build = pytest.importorskip("ase.build")
+    from logmd import LogMD
+
+    monkeypatch.chdir(tmp_path)
+    log = RunLog(str(tmp_path / "spool" / "earlier"))
+    log.append(
+        "earlier-project",
+        {"run_id": "earlier", "frame_num": "1", "file_contents": "ATOM"},
+    )
+    log.close()
+
+    logmd = LogMD(engine=engine, spool=str(tmp_path / "spool"))
+    logmd(ase_build.molecule("H2O"))
+    logmd.cleanup()
+
+    with upload_server.lock:
+        bodies = [body for _, body in upload_server.requests]
+    projects = {
+        frame["run_id"]: body["project"]
+        for body in bodies
+        for frame in body.get("frames", [body])
+    }
+    assert projects == {"earlier": "earlier-project", logmd.run_id: logmd.project}
+
+
+def test_retried_binary_frames_decode(tmp_path, upload_server, fresh_pool):
+    ase_build = pytest.importorskip("ase.build")
+    from logmd import LogMD
+    from logmd.codec import ChannelDecoder, FrameDecoder
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(
+        frame_format="binary",
+        keyframe_interval=8,
+        channels={"forces": 0.01},
+        spool=str(tmp_path / "spool"),
+        num_workers=1,
+        max_workers=1,
+    )
+    expected = []
+    for i in range(30):
+        if i in (3, 12, 20):
+            upload_server.failures = 2
+        atoms.positions += 0.01
+        logmd(atoms, channels={"forces": atoms.positions.copy()})
+        expected.append(LogMD.ase_pdb_string(atoms))
+    logmd.cleanup()
+
+    received = sorted(upload_server.frames, key=lambda frame: int(frame["frame_num"]))
+    assert [int(frame["frame_num"]) for frame in received] == list(range(1, 31))
+    decoder = FrameDecoder()
+    assert [decoder.decode(frame) for frame in received] == expected
+
+    # the single worker uploads in order, frames received after a later one were retried.
+    latest, retried = 0, 0
+    topology = received[0]["topology"]
+    for frame in upload_server.frames:
+        frame_num = int(frame["frame_num"])
+        if frame_num < latest:
+            assert FrameDecoder(topology).decode(frame) == expected[frame_num - 1]
+            ChannelDecoder().decode(frame["forces"], frame_num)
+            retried += 1
+        latest = max(latest, frame_num)
+    assert retried > 0
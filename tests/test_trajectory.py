@@ -0,0 +1,109 @@
+import os
+import sys
+
+import pytest
+
+from logmd.trajectory import (
+    FOOTER,
+    HEADER,
+    TrajectoryReader,
+    TrajectoryWriter,
+    _read_index,
+)
+
+
+def pdb(frame_num: int) -> str:
+    return f"MODEL {frame_num}\nATOM      1  C   MOL A   1    {frame_num:8.3f}   0.000   0.000\nEND\n"
+
+
+def write(path: str, frame_nums, close: bool = True) -> TrajectoryWriter:
+    writer = TrajectoryWriter(path)
+    for frame_num in frame_nums:
+        writer.append(frame_num, pdb(frame_num))
+    if close:
+        writer.close()
+    else:
+        writer.file.flush()
+    return writer
+
+
+def test_closed_file_is_read_from_its_index(tmp_path):
+    path = str(tmp_path / "trajectory.lmdt")
+    write(path, [1, 2, 5])
+
+    with open(path, "rb") as f:
+        index, end = _read_index(f, os.path.getsize(path))
+        f.seek(os.path.getsize(path) - FOOTER.size)
+        index_offset, count, _ = FOOTER.unpack(f.read(FOOTER.size))
+    assert (end, count) == (index_offset, 3)
+    assert [frame_num for frame_num, _ in index] == [1, 2, 5]
+
+    reader = TrajectoryReader(path)
+    assert reader.frame_nums == [1, 2, 5]
+    assert reader[1] == pdb(2)
+    assert list(reader) == [pdb(1), pdb(2), pdb(5)]
+
+
+def test_truncated_file_is_scanned(tmp_path):
+    path = str(tmp_path / "trajectory.lmdt")
+    writer = write(path, [1, 2, 3], close=False)
+    size = os.path.getsize(path)
+    writer.file.close()
+    # the process died while writing the third frame, there is no index.
+    os.truncate(path, size - 5)
+
+    reader = TrajectoryReader(path)
+    assert reader.frame_nums == [1, 2]
+    assert list(reader) == [pdb(1), pdb(2)]
+
+
+def test_reopened_file_appends_after_the_last_complete_frame(tmp_path):
+    path = str(tmp_path / "trajectory.lmdt")
+    writer = write(path, [1, 2, 3], close=False)
+    size = os.path.getsize(path)
+    writer.file.close()
+    os.truncate(path, size - 5)
+
+    write(path, [4, 5])
+    reader = TrajectoryReader(path)
+    assert reader.frame_nums == [1, 2, 4, 5]
+    assert list(reader) == [pdb(1), pdb(2), pdb(4), pdb(5)]
+
+    # reopening a closed file drops its index and writes a new one.
+    write(path, [6])
+    assert TrajectoryReader(path).frame_nums == [1, 2, 4, 5, 6]
+
+
+def test_empty_file_has_no_frames(tmp_path):
+    path = str(tmp_path / "trajectory.lmdt")
+    write(path, [])
+    assert os.path.getsize(path) == HEADER.size + FOOTER.size
+    assert len(TrajectoryReader(path)) == 0
+
+
+def test_export_pdb(tmp_path):
+    path = str(tmp_path / "trajectory.lmdt")
+    write(path, [1, 3])
+
+    assert TrajectoryReader(path).export_pdb(str(tmp_path / "pdb")) == 2
+    assert sorted(os.listdir(tmp_path / "pdb")) == ["1.pdb", "3.pdb"]
+    with open(tmp_path / "pdb" / "3.pdb") as f:
+        assert f.read() == pdb(3)
+
+
+def test_export_command(tmp_path, monkeypatch):
+    testing = pytest.importorskip("typer.testing")
+    monkeypatch.setattr(sys, "argv", ["logmd"])
+    from logmd.cli.main import app
+
+    path = str(tmp_path / "trajectory.lmdt")
+    write(path, [1, 2])
+
+    result = testing.CliRunner().invoke(app, ["export", path, str(tmp_path / "out")])
+    assert result.exit_code == 0, result.output
+    assert sorted(os.listdir(tmp_path / "out")) == ["1.pdb", "2.pdb"]
+
+    result = testing.CliRunner().invoke(app, ["export", path])
+    assert result.exit_code == 0, result.output
+    with open(tmp_path / "2.pdb") as f:
+        assert f.read() == pdb(2)
@@ -0,0 +1,162 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import pytest
+
+from logmd.compression import MIN_SIZE, AdaptiveCompressor
+from logmd.upload import Batcher
+
+ase_build = pytest.importorskip("ase.build")
+
+
+def log_frames(num_frames: int, **settings):
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(**settings)
+    for _ in range(num_frames):
+        atoms.positions += 0.01
+        logmd(atoms)
+    logmd.cleanup()
+    return logmd
+
+
+@pytest.mark.parametrize("engine", ["process", "async"])
+def test_batched_compressed_frames_arrive_exactly_once(
+    upload_server, fresh_pool, engine
+):
+    logmd = log_frames(
+        60, engine=engine, num_workers=2, batch_size=8, linger_ms=50, compress=True
+    )
+
+    frame_nums = sorted(int(frame["frame_num"]) for frame in upload_server.frames)
+    assert frame_nums == list(range(1, 61))
+    assert {frame["run_id"] for frame in upload_server.frames} == {logmd.run_id}
+    assert any(len(body.get("frames", ())) > 1 for _, body in upload_server.requests)
+    assert {encoding for encoding, _ in upload_server.requests} <= {"deflate", None}
+    assert "deflate" in {encoding for encoding, _ in upload_server.requests}
+    stats = logmd.stats()
+    assert stats["errors"] == 0
+    assert stats["sent_bytes"] < stats["raw_bytes"]
+
+
+def test_batcher_lingers_for_a_full_batch():
+    upload_queue: queue.Queue = queue.Queue()
+    batcher = Batcher(batch_size=4, linger_ms=200)
+
+    def produce():
+        for i in range(4):
+            upload_queue.put(i)
+            time.sleep(0.02)
+
+    threading.Thread(target=produce).start()
+    assert batcher.next_batch(upload_queue) == ([0, 1, 2, 3], False)
+
+
+def test_batcher_sends_a_partial_batch_after_linger():
+    upload_queue: queue.Queue = queue.Queue()
+    batcher = Batcher(batch_size=4, linger_ms=50)
+    upload_queue.put(0)
+    upload_queue.put(1)
+    t0 = time.monotonic()
+    assert batcher.next_batch(upload_queue) == ([0, 1], False)
+    assert 0.04 < time.monotonic() - t0 < 1
+
+
+def test_batcher_returns_frames_before_the_stop_signal():
+    upload_queue: queue.Queue = queue.Queue()
+    batcher = Batcher(batch_size=4, linger_ms=50)
+    for item in (0, 1, None, 2):
+        upload_queue.put(item)
+    assert batcher.next_batch(upload_queue) == ([0, 1], True)
+    assert upload_queue.get_nowait() == 2
+
+
+EXIT_WITHOUT_CLEANUP = """
+import sys
+
+import ase.build
+
+import logmd.upload
+import logmd.worker
+from logmd import LogMD
+
+logmd.upload.get_upload_url = logmd.worker.get_upload_url = lambda: sys.argv[1]
+atoms = ase.build.molecule("CH3CH2OH")
+logmd = LogMD(engine=sys.argv[2], batch_size=4)
+for _ in range(100):
+    atoms.positions += 0.01
+    logmd(atoms)
+"""
+
+
+@pytest.mark.parametrize("engine", ["process", "async"])
+def test_frames_are_uploaded_when_the_interpreter_exits(upload_server, engine):
+    import subprocess
+    import sys
+
+    result = subprocess.run(
+        [sys.executable, "-c", EXIT_WITHOUT_CLEANUP, upload_server.url, engine],
+        capture_output=True,
+        text=True,
+        timeout=60,
+        check=False,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "Traceback" not in result.stderr
+    assert sorted(int(frame["frame_num"]) for frame in upload_server.frames) == list(
+        range(1, 101)
+    )
+
+
+def test_compressor_sends_what_deflate_does_not_shrink_as_is():
+    compressor = AdaptiveCompressor()
+    text = b'{"file_contents": "' + b"ATOM      1  C   MOL A   1" * 100 + b'"}'
+    noise = os.urandom(4096)
+    assert compressor.compress(text[: MIN_SIZE - 1]) == (text[: MIN_SIZE - 1], None)
+    assert compressor.compress(text)[1] == "deflate"
+    assert compressor.compress(noise) == (noise, None)
+
+
+def test_runs_sharing_the_pool_keep_their_compression(
+    upload_server, fresh_pool, capsys
+):
+    plain = log_frames(10, batch_size=4)
+    compressed = log_frames(10, batch_size=8, compress=True)
+
+    assert "ignoring batch_size=8" in capsys.readouterr().out
+    encodings = {}
+    for encoding, body in upload_server.requests:
+        for frame in body.get("frames", [body]):
+            encodings.setdefault(frame["run_id"], set()).add(encoding)
+    assert encodings[plain.run_id] == {None}
+    # a request of a single small frame is below MIN_SIZE and sent as is.
+    assert "deflate" in encodings[compressed.run_id]
+    for encoding, body in upload_server.requests:
+        if (
+            encoding is None
+            and body.get("frames", [body])[0]["run_id"] == compressed.run_id
+        ):
+            assert len(json.dumps(body, separators=(",", ":"))) < MIN_SIZE
+    assert plain.stats()["sent_bytes"] == plain.stats()["raw_bytes"]
+
+
+@pytest.mark.parametrize("engine", ["process", "async"])
+def test_frames_that_can_not_be_sent_fail(upload_server, fresh_pool, engine):
+    import numpy as np
+
+    from logmd import LogMD
+
+    atoms = ase_build.molecule("CH3CH2OH")
+    logmd = LogMD(engine=engine, num_workers=1)
+    logmd(atoms, data_dict={"step": np.int64(5)})  # JSON can not serialize it
+    logmd(atoms)
+    t0 = time.monotonic()
+    logmd.cleanup()
+
+    assert time.monotonic() - t0 < 10
+    assert logmd.stats()["errors_by_status"] == {-1: 1}
+    assert [frame["frame_num"] for frame in upload_server.frames] == ["2"]
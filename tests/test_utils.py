@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from logmd.utils import PDBTemplate, update_pdb_positions
+
+NUM_ATOMS = 12
+
+
+def topology(num_atoms: int = NUM_ATOMS) -> str:
+    lines = [
+        "CRYST1   10.000   10.000   10.000  90.00  90.00  90.00 P 1",
+        "MODEL     1",
+    ]
+    for i in range(num_atoms):
+        record = "HETATM" if i % 3 == 0 else "ATOM  "
+        lines.append(
+            f"{record}{i + 1:5d}  O   HOH A{i:4d}    {0:8.3f}{0:8.3f}{0:8.3f}  1.00  0.00           O"
+        )
+    lines += ["ENDMDL", "END"]
+    return "\n".join(lines) + "\n"
+
+
+def test_render_fuzz():
+    template = PDBTemplate(topology())
+    rng = np.random.default_rng(0)
+    for _ in range(2000):
+        scale = rng.choice(
+            [0.01, 1, 100, 5000, 20000]
+        )  # beyond 9999.999 the fallback formats
+        positions = rng.uniform(-scale, scale, (NUM_ATOMS, 3))
+        # values on and within float error of 0.0005 boundaries.
+        ties = rng.random(positions.shape) < 0.3
+        boundaries = (np.round(positions * 1000) + 0.5) / 1000
+        offsets = rng.choice([0.0, 1e-12, -1e-12, 1e-9, -1e-9], positions.shape)
+        positions[ties] = boundaries[ties] + offsets[ties]
+        # "-0.000"
+        zeros = rng.random(positions.shape) < 0.05
+        positions[zeros] = rng.uniform(-0.0005, 0.0005, zeros.sum())
+        if rng.random() < 0.02:
+            positions[rng.integers(NUM_ATOMS), rng.integers(3)] = rng.choice(
+                [np.nan, np.inf, -np.inf]
+            )
+        assert template.render(positions) == update_pdb_positions(topology(), positions)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        -0.0,
+        -0.0004,
+        0.0005,
+        -0.0005,
+        1.0005,
+        2.0015,
+        9999.999,
+        -999.9994,
+        99999.5,
+        -1000.0,
+        123456.0,
+        np.nan,
+        np.inf,
+        -np.inf,
+    ],
+)
+def test_render_edge_values(value):
+    template = PDBTemplate(topology())
+    positions = np.full((NUM_ATOMS, 3), 1.5)
+    positions[NUM_ATOMS // 2, 1] = value
+    positions[0] = value  # a HETATM line
+    assert template.render(positions) == update_pdb_positions(topology(), positions)
+
+
+def test_render_keeps_the_trailing_newline_on_request():
+    positions = np.ones((NUM_ATOMS, 3))
+    assert (
+        PDBTemplate(topology(), trailing_newline=True).render(positions)
+        == update_pdb_positions(topology(), positions) + "\n"
+    )
+    with pytest.raises(ValueError, match="12 atoms"):
+        PDBTemplate(topology()).render(positions[:-1])